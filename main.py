@@ -1,3 +1,4 @@
+import argparse
 import configparser
 import ctypes
 import sys
@@ -6,33 +7,2872 @@ from tkinter import messagebox, ttk
 import random
 import json
 import os
-from faker import Faker
-import requests
 import html
-import socket
-import shelve
+import queue
+import threading
+import time
+import contextlib
+import bisect
+import functools
+import importlib
+import hashlib
+import math
+import itertools
+import csv
+import re
+import zlib
+from array import array
+from collections import OrderedDict, deque
+
+QUESTION_GENERATOR_VERSION = 5
+DEFAULT_BANK_SEED = 0
+DEFAULT_BANK_SIZE = 100
+BANK_CHUNK_SIZE = 10
+OPTION_COUNT = 4
+OPTION_ORDERS = list(itertools.permutations(range(OPTION_COUNT)))
+OPENTDB_URL = "https://opentdb.com/api.php"
+OPENTDB_BATCH_SIZE = 50
+OPENTDB_MIN_INTERVAL = 5.0
 
 if sys.platform == "win32":
     ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID("YourAppID.UniqueName")
 
-def resource_path(relative_path):
-    """ Get absolute path to resources for both dev and PyInstaller """
+IMPORTS_CPU_TIME = time.process_time()
+
+def new_faker():
+    """Create a Faker instance, importing faker on first use since it loads hundreds of provider modules"""
+    from faker import Faker
+    return Faker()
+
+def new_http_session():
+    """Create a pooled HTTP session, importing requests (urllib3, SSL setup) on first use"""
+    import requests
+    return requests.Session()
+
+def warm_up_imports():
+    """Import the heavy optional modules on a background thread once the first frame is up"""
+
+    def run():
+        for name in ("faker", "requests"):
+
+            try:
+                importlib.import_module(name)
+
+            except ImportError as e:
+                print(f"Error importing {name}: {e}")
+    threading.Thread(target=run, daemon=True).start()
+
+class LatencyHistogram:
+    """Latency histogram with log-spaced buckets from 1 us to about 8 s"""
+    BUCKETS = tuple(1e-6 * 2 ** i for i in range(24))
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile"""
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.BUCKETS, self.counts):
+            cumulative += count
+
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+class Metrics:
+    """Named latency histograms fed by timing decorators and context managers"""
+
+    def __init__(self):
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        with self.lock:
+            histogram = self.histograms.get(name)
+
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """Decorator recording each call's duration under name"""
+
+        def decorator(func):
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+
+                try:
+                    return func(*args, **kwargs)
+
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def summary(self):
+        with self.lock:
+            return {
+                name: {
+                    "count": h.count,
+                    "mean": h.sum / h.count if h.count else 0.0,
+                    "p50": h.quantile(0.5),
+                    "p99": h.quantile(0.99)
+                }
+                for name, h in sorted(self.histograms.items())
+            }
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP quiz_latency_seconds Latency of quiz hot paths",
+            "# TYPE quiz_latency_seconds histogram"
+        ]
+        with self.lock:
+            for name, h in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(h.BUCKETS, h.counts):
+                    cumulative += count
+                    lines.append(f'quiz_latency_seconds_bucket{{path="{name}",le="{bound:.6g}"}} {cumulative}')
+                lines.append(f'quiz_latency_seconds_bucket{{path="{name}",le="+Inf"}} {h.count}')
+                lines.append(f'quiz_latency_seconds_sum{{path="{name}"}} {h.sum:.9f}')
+                lines.append(f'quiz_latency_seconds_count{{path="{name}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, storage_path):
+        """Write metrics.prom and metrics.json under storage_path"""
+
+        try:
+
+            with open(os.path.join(storage_path, "metrics.prom"), "w") as f:
+                f.write(self.to_prometheus())
+
+            with open(os.path.join(storage_path, "metrics.json"), "w") as f:
+                json.dump(self.summary(), f, indent=2)
+
+        except Exception as e:
+            print(f"Error saving metrics: {e}")
+
+metrics = Metrics()
+
+class StartupProfiler:
+    """Wall-clock durations of startup phases, in order"""
+
+    def __init__(self):
+        self.phases = [("interpreter start + imports (CPU)", IMPORTS_CPU_TIME)]
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def report(self, budget_ms=None):
+        """Print the breakdown; returns False if the total exceeds budget_ms"""
+        total = sum(duration for _, duration in self.phases)
+        for name, duration in self.phases:
+            print(f"{name:<36}{duration * 1000:>9.1f} ms")
+        print(f"{'total':<36}{total * 1000:>9.1f} ms")
+
+        if budget_ms is not None and total * 1000 > budget_ms:
+            print(f"Startup exceeded budget of {budget_ms:.0f} ms")
+            return False
+        return True
+
+class MemoryAccountant:
+    """Per-subsystem memory use with an optional budget, plus tracemalloc totals and top allocation sites
+
+    Subsystems are registered with a roots() callable; their size is a walk over everything reachable from
+    those roots, counting each object once, for the first subsystem that reaches it. Trims run in a fixed
+    priority order while the total is over budget, so the same state is always trimmed the same way.
+    """
+
+    def __init__(self, budget_mb=None, top_sites=10):
+        self.budget = budget_mb * 1024 * 1024 if budget_mb else None
+        self.top_sites = top_sites
+        self.subsystems = OrderedDict()
+        self.trims = []
+
+    def register(self, name, roots, trim=None, priority=0):
+        """Add a subsystem; trim() frees some of it and returns False once there is nothing left to free
+
+        Lower priorities are trimmed first; ties keep registration order.
+        """
+        self.subsystems[name] = (roots, trim, priority)
+
+    @staticmethod
+    def start_tracing(frames=1):
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    @staticmethod
+    def deep_size(roots, seen):
+        import types
+        skipped = (type, types.ModuleType, types.FunctionType, types.MethodType)
+        size = 0
+        stack = list(roots)
+        while stack:
+            obj = stack.pop()
+
+            if id(obj) in seen or isinstance(obj, skipped):
+                continue
+            seen.add(id(obj))
+            size += sys.getsizeof(obj)
+
+            if isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+                stack.extend(obj)
+            elif not isinstance(obj, (str, bytes, int, float, array)):
+
+                if hasattr(obj, "__dict__"):
+                    stack.append(obj.__dict__)
+                for slot in getattr(type(obj), "__slots__", ()):
+
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+        return size
+
+    def sizes(self):
+        seen = set()
+        return {name: self.deep_size(roots(), seen) for name, (roots, _, _) in self.subsystems.items()}
+
+    def over_budget(self, sizes):
+        return self.budget is not None and sum(sizes.values()) > self.budget
+
+    def trim_step(self, sizes):
+        """Run the first trim, in priority order, that frees something; False once nothing is left to trim"""
+        for name, (_, trim, _) in sorted(self.subsystems.items(), key=lambda item: item[1][2]):
+
+            if trim is not None and trim():
+                self.trims.append({"subsystem": name, "size_before": sizes[name], "time": time.time()})
+                return True
+        return False
+
+    def enforce(self):
+        """Trim subsystems in priority order until usage fits the budget; returns the final sizes
+
+        Every step re-walks all subsystems, so the GUI measures on a worker thread and trims once per
+        measurement instead of calling this.
+        """
+        sizes = self.sizes()
+        while self.over_budget(sizes) and self.trim_step(sizes):
+            sizes = self.sizes()
+        return sizes
+
+    def report(self):
+        """Subsystem sizes, the budget, trims so far and, when tracing, tracemalloc totals and top sites"""
+        sizes = self.sizes()
+        data = {
+            "subsystems": sizes,
+            "total": sum(sizes.values()),
+            "budget": self.budget,
+            "trims": list(self.trims)
+        }
+        import tracemalloc
+
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            stats = tracemalloc.take_snapshot().statistics("lineno")[:self.top_sites]
+            data["tracemalloc"] = {
+                "current": current,
+                "peak": peak,
+                "top_sites": [{"site": str(stat.traceback), "size": stat.size, "count": stat.count} for stat in stats]
+            }
+        return data
+
+    def dump(self, storage_path, report=None):
+        """Write memory.json under storage_path, from report or a fresh one"""
+
+        try:
+
+            with open(os.path.join(storage_path, "memory.json"), "w") as f:
+                json.dump(report or self.report(), f, indent=2)
+
+        except Exception as e:
+            print(f"Error saving memory report: {e}")
+
+def resource_path(relative_path):
+    """ Get absolute path to resources for both dev and PyInstaller """
+
+    try:
+        base_path = sys._MEIPASS
+
+    except Exception:
+        base_path = os.path.abspath(".")
+    full_path = os.path.join(base_path, relative_path)
+
+    if not os.path.exists(full_path):
+        raise FileNotFoundError(f"Resource not found: {full_path}")
+    return full_path
+
+class Question:
+    """One multiple-choice question; the answer is an index into options"""
+    __slots__ = ("text", "options", "answer", "category", "template")
+
+    def __init__(self, text, options, answer, category="", template=""):
+        self.text = text
+        self.options = tuple(sys.intern(option) for option in options)
+        self.answer = answer
+        self.category = sys.intern(category)
+        self.template = sys.intern(template)
+
+    @property
+    def answer_text(self):
+        return self.options[self.answer]
+
+    def to_row(self):
+        return (self.text, self.options, self.answer, self.category, self.template)
+
+class QuestionBank:
+    """Append-only question storage in parallel arrays, with option, category and template strings interned"""
+    __slots__ = ("texts", "strings", "string_ids", "option_ids", "answers", "category_ids", "template_ids")
+
+    def __init__(self, questions=()):
+        self.texts = []
+        self.strings = []
+        self.string_ids = {}
+        self.option_ids = array("I")
+        self.answers = array("B")
+        self.category_ids = array("I")
+        self.template_ids = array("I")
+        self.extend(questions)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __getitem__(self, index):
+        start = index * OPTION_COUNT
+        strings = self.strings
+        return Question(
+            self.texts[index],
+            [strings[i] for i in self.option_ids[start:start + OPTION_COUNT]],
+            self.answers[index],
+            strings[self.category_ids[index]],
+            strings[self.template_ids[index]]
+        )
+
+    def _string_id(self, value):
+        string_id = self.string_ids.get(value)
+
+        if string_id is None:
+            string_id = self.string_ids[value] = len(self.strings)
+            self.strings.append(sys.intern(value))
+        return string_id
+
+    def append(self, question):
+        self.texts.append(question.text)
+        self.option_ids.extend(self._string_id(option) for option in question.options)
+        self.answers.append(question.answer)
+        self.category_ids.append(self._string_id(question.category))
+        self.template_ids.append(self._string_id(question.template))
+
+    def extend(self, questions):
+        for question in questions:
+            self.append(question)
+
+    def to_state(self, limit=None):
+        """Plain builtins for pickling; limit keeps only the first questions"""
+        count = len(self) if limit is None else min(limit, len(self))
+        return (
+            self.texts[:count],
+            list(self.strings),
+            self.option_ids[:count * OPTION_COUNT].tobytes(),
+            self.answers[:count].tobytes(),
+            self.category_ids[:count].tobytes(),
+            self.template_ids[:count].tobytes()
+        )
+
+    @classmethod
+    def from_state(cls, state):
+        bank = cls()
+        bank.load_state(state)
+        return bank
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def load_state(self, state):
+        """Replace the contents in place with a state from to_state; states saved before templates were kept load with none"""
+        texts, strings, option_ids, answers, category_ids, *template_ids = state
+        self.texts[:] = texts
+        self.strings[:] = [sys.intern(string) for string in strings]
+        self.string_ids.clear()
+        self.string_ids.update((string, i) for i, string in enumerate(self.strings))
+        self.option_ids = array("I", option_ids)
+        self.answers = array("B", answers)
+        self.category_ids = array("I", category_ids)
+
+        if template_ids:
+            self.template_ids = array("I", template_ids[0])
+        else:
+            self.template_ids = array("I", [self._string_id("")]) * len(texts)
+
+class QuestionTemplate:
+    """A question template whose fields are only evaluated when it is picked"""
+
+    def __init__(self, build, difficulty, category, weight=1):
+        self.build = build
+        self.difficulty = difficulty
+        self.category = category
+        self.weight = weight
+        self.name = build.__name__
+        self.build_batch = None
+
+class TemplateRegistry:
+    """Question templates grouped by difficulty, picked by weight"""
+
+    def __init__(self):
+        self.templates = {}
+
+    def register(self, difficulty, category, weight=1):
+        """Decorator adding a build(fake, rng) -> (question, options, answer_index) function"""
+
+        def decorator(build):
+            self.templates.setdefault(difficulty, []).append(
+                QuestionTemplate(build, difficulty, category, weight)
+            )
+            return build
+        return decorator
+
+    def generate(self, difficulty, n, fake=None, rng=random):
+        """Build n questions, evaluating only the template chosen for each one"""
+
+        if fake is None:
+            fake = new_faker()
+        templates = self.templates[difficulty]
+        picks = rng.choices(templates, weights=[t.weight for t in templates], k=n)
+        questions = []
+        for template in picks:
+            question, options, answer_idx = template.build(fake, rng)
+            questions.append(Question(question, options, answer_idx, template.category, template.name))
+        return questions
+
+    def vectorize(self, build):
+        """Decorator adding a build_batch(vocab, np_rng, n) -> (texts, options, answers) version of a template"""
+
+        def decorator(build_batch):
+            for templates in self.templates.values():
+                for template in templates:
+
+                    if template.build is build:
+                        template.build_batch = build_batch
+            return build_batch
+        return decorator
+
+    def generate_batch(self, difficulty, n, seed=None):
+        """Build n questions in one vectorized pass over the vocabulary tables; needs NumPy
+
+        Falls back to generate() with a seeded Random when NumPy is not installed.
+        """
+
+        try:
+            import numpy as np
+
+        except ImportError:
+            fake = new_faker()
+            fake.seed_instance(seed)
+            return self.generate(difficulty, n, fake, random.Random(seed))
+        vocab = load_vocabulary()
+        rng = np.random.default_rng(seed)
+        templates = self.templates[difficulty]
+        weights = np.array([t.weight for t in templates], dtype=float)
+        picks = rng.choice(len(templates), size=n, p=weights / weights.sum())
+        questions = [None] * n
+        for index, template in enumerate(templates):
+            positions = np.flatnonzero(picks == index).tolist()
+
+            if not positions:
+                continue
+            texts, options, answers = template.build_batch(vocab, rng, len(positions))
+            category = template.category
+            for position, text, row, answer in zip(positions, texts, options, answers):
+                questions[position] = Question(text, row, answer, category, template.name)
+        return questions
+
+class Vocabulary:
+    """Faker word, country, city, name, color, company and catch phrase tables as NumPy string arrays
+
+    Words come straight from Faker's word list; composed values (cities, names, ...) are sampled once from a
+    seeded Faker, so batches only depend on their seed.
+    """
+    SAMPLE_SIZE = 1024
+
+    def __init__(self, np, fake=None):
+
+        if fake is None:
+            fake = new_faker()
+        fake.seed_instance(0)
+        self.words = np.array(fake.get_words_list())
+        self.titles = np.char.capitalize(self.words)
+        self.uppers = np.char.upper(self.words)
+        self.symbols = np.char.upper(np.char.ljust(self.words, 2).astype("U2"))
+        for name in ("country", "city", "name", "color_name", "company", "catch_phrase"):
+            method = getattr(fake, name)
+            setattr(self, name, np.array(list(dict.fromkeys(method() for _ in range(self.SAMPLE_SIZE)))))
+
+@functools.lru_cache(maxsize=1)
+def load_vocabulary():
+    import numpy as np
+    return Vocabulary(np)
+
+def pick(table, rng, n, k=None):
+    """Gather n (or n x k) random entries of a vocabulary table as Python strings"""
+    return table[rng.integers(0, len(table), n if k is None else (n, k))].tolist()
+
+def pick_options(table, rng, n):
+    """Four random options per question and a random answer index, like the scalar templates"""
+    return pick(table, rng, n, OPTION_COUNT), rng.integers(0, OPTION_COUNT, n).tolist()
+
+def number_options(rng, low, high, n):
+    """Four random integer options per question (inclusive bounds) and a random answer index"""
+    return rng.integers(low, high + 1, (n, OPTION_COUNT)).astype("U").tolist(), rng.integers(0, OPTION_COUNT, n).tolist()
+
+def computed_options(rng, low, high, results, n):
+    """Three random distractors followed by the computed result, which is always the answer"""
+    options = rng.integers(low, high + 1, (n, OPTION_COUNT)).astype("U")
+    options[:, 3] = results
+    return options.tolist(), [3] * n
+
+question_templates = TemplateRegistry()
+
+@question_templates.register("Easy", "geography")
+def largest_city(fake, rng):
+    return (f"What is the largest city in {fake.country()}?",
+            [fake.city() for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Easy", "math")
+def simple_addition(fake, rng):
+    return (f"What is {rng.randint(5, 20)} + {rng.randint(5, 20)}?",
+            [str(rng.randint(10, 30)) for _ in range(3)] +
+            [str(rng.randint(5, 20) + rng.randint(5, 20))],
+            3)
+
+@question_templates.register("Easy", "science")
+def planet_nickname(fake, rng):
+    return (f"Which planet is known as the {fake.word()} planet?",
+            [fake.word().capitalize() for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Easy", "general")
+def object_color(fake, rng):
+    return (f"What color is a {fake.word()}?",
+            [fake.color_name() for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Easy", "math")
+def shape_sides(fake, rng):
+    return (f"How many sides does a {fake.word()} have?",
+            [str(rng.randint(3, 10)) for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Medium", "literature")
+def book_author(fake, rng):
+    return (f"Who wrote '{fake.catch_phrase()}'?",
+            [fake.name() for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Medium", "science")
+def chemical_symbol(fake, rng):
+    return (f"What is the chemical symbol for {fake.word().capitalize()}?",
+            [fake.word()[:2].upper() for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Medium", "history")
+def company_founded(fake, rng):
+    return (f"In what year was {fake.company()} founded?",
+            [str(rng.randint(1800, 2023)) for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Medium", "general")
+def largest_thing(fake, rng):
+    return (f"What is the largest {fake.word()} in the world?",
+            [fake.word().capitalize() for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Medium", "science")
+def periodic_table_size(fake, rng):
+    return ("How many elements are in the periodic table?",
+            [str(rng.randint(50, 200)) for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Hard", "math")
+def derivative(fake, rng):
+    return (f"What is the derivative of x^{rng.randint(2, 5)}?",
+            [f"{rng.randint(1, 5)}x^{rng.randint(1, 4)}" for _ in range(3)] +
+            [f"{rng.randint(2, 5)}x^{rng.randint(1, 4)}"],
+            3)
+
+@question_templates.register("Hard", "science")
+def theory_author(fake, rng):
+    return (f"Who developed the theory of {fake.word()}?",
+            [fake.name() for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Hard", "science")
+def atomic_number(fake, rng):
+    return (f"What is the atomic number of {fake.word().capitalize()}?",
+            [str(rng.randint(1, 100)) for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Hard", "science")
+def physics_acronym(fake, rng):
+    return (f"In quantum physics, what does {fake.word().upper()} stand for?",
+            [fake.word() for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Hard", "science")
+def physical_constant(fake, rng):
+    return (f"What is the {fake.word()} constant approximately equal to?",
+            [str(round(rng.uniform(1.0, 10.0), 4)) for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Googly", "math")
+def travel_time(fake, rng):
+    return (f"If a {fake.word()} is traveling at {rng.randint(10, 100)} mph, how long to travel {rng.randint(100, 500)} miles?",
+            [f"{rng.uniform(1, 10):.2f} hours" for _ in range(3)] +
+            [f"{rng.randint(100, 500)/rng.randint(10, 100):.2f} hours"],
+            3)
+
+@question_templates.register("Googly", "logic")
+def next_number(fake, rng):
+    return (f"What is the next number: {rng.randint(1, 10)}, {rng.randint(11, 20)}, {rng.randint(21, 30)}, __?",
+            [str(rng.randint(31, 50)) for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Googly", "logic")
+def odd_word_out(fake, rng):
+    return (f"Which word doesn't belong: {fake.word()}, {fake.word()}, {fake.word()}, {fake.word()}?",
+            [fake.word() for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.register("Googly", "math")
+def bracket_arithmetic(fake, rng):
+    return (f"Solve: ({rng.randint(1, 10)} + {rng.randint(1, 10)}) × {rng.randint(1, 10)}",
+            [str(rng.randint(10, 100)) for _ in range(3)] +
+            [str((rng.randint(1, 10) + rng.randint(1, 10)) * rng.randint(1, 10))],
+            3)
+
+@question_templates.register("Googly", "general")
+def word_riddle(fake, rng):
+    return (f"What is the {fake.word()} of {fake.word()} in {fake.country()}?",
+            [fake.word().capitalize() for _ in range(4)],
+            rng.randint(0, 3))
+
+@question_templates.vectorize(largest_city)
+def largest_city_batch(vocab, rng, n):
+    return [f"What is the largest city in {c}?" for c in pick(vocab.country, rng, n)], *pick_options(vocab.city, rng, n)
+
+@question_templates.vectorize(simple_addition)
+def simple_addition_batch(vocab, rng, n):
+    a, b = rng.integers(5, 21, (2, n))
+    return ([f"What is {x} + {y}?" for x, y in zip(a.tolist(), b.tolist())],
+            *computed_options(rng, 10, 30, (a + b).astype("U"), n))
+
+@question_templates.vectorize(planet_nickname)
+def planet_nickname_batch(vocab, rng, n):
+    return [f"Which planet is known as the {w} planet?" for w in pick(vocab.words, rng, n)], *pick_options(vocab.titles, rng, n)
+
+@question_templates.vectorize(object_color)
+def object_color_batch(vocab, rng, n):
+    return [f"What color is a {w}?" for w in pick(vocab.words, rng, n)], *pick_options(vocab.color_name, rng, n)
+
+@question_templates.vectorize(shape_sides)
+def shape_sides_batch(vocab, rng, n):
+    return [f"How many sides does a {w} have?" for w in pick(vocab.words, rng, n)], *number_options(rng, 3, 10, n)
+
+@question_templates.vectorize(book_author)
+def book_author_batch(vocab, rng, n):
+    return [f"Who wrote '{p}'?" for p in pick(vocab.catch_phrase, rng, n)], *pick_options(vocab.name, rng, n)
+
+@question_templates.vectorize(chemical_symbol)
+def chemical_symbol_batch(vocab, rng, n):
+    return ([f"What is the chemical symbol for {w}?" for w in pick(vocab.titles, rng, n)],
+            *pick_options(vocab.symbols, rng, n))
+
+@question_templates.vectorize(company_founded)
+def company_founded_batch(vocab, rng, n):
+    return [f"In what year was {c} founded?" for c in pick(vocab.company, rng, n)], *number_options(rng, 1800, 2023, n)
+
+@question_templates.vectorize(largest_thing)
+def largest_thing_batch(vocab, rng, n):
+    return [f"What is the largest {w} in the world?" for w in pick(vocab.words, rng, n)], *pick_options(vocab.titles, rng, n)
+
+@question_templates.vectorize(periodic_table_size)
+def periodic_table_size_batch(vocab, rng, n):
+    return ["How many elements are in the periodic table?"] * n, *number_options(rng, 50, 200, n)
+
+@question_templates.vectorize(derivative)
+def derivative_batch(vocab, rng, n):
+    power = rng.integers(2, 6, n)
+    coefficients = rng.integers(1, 6, (n, OPTION_COUNT))
+    coefficients[:, 3] = power
+    powers = rng.integers(1, 5, (n, OPTION_COUNT))
+    powers[:, 3] = power - 1
+    options = [[f"{c}x^{p}" for c, p in zip(cs, ps)] for cs, ps in zip(coefficients.tolist(), powers.tolist())]
+    return [f"What is the derivative of x^{p}?" for p in power.tolist()], options, [3] * n
+
+@question_templates.vectorize(theory_author)
+def theory_author_batch(vocab, rng, n):
+    return [f"Who developed the theory of {w}?" for w in pick(vocab.words, rng, n)], *pick_options(vocab.name, rng, n)
+
+@question_templates.vectorize(atomic_number)
+def atomic_number_batch(vocab, rng, n):
+    return [f"What is the atomic number of {w}?" for w in pick(vocab.titles, rng, n)], *number_options(rng, 1, 100, n)
+
+@question_templates.vectorize(physics_acronym)
+def physics_acronym_batch(vocab, rng, n):
+    return ([f"In quantum physics, what does {w} stand for?" for w in pick(vocab.uppers, rng, n)],
+            *pick_options(vocab.words, rng, n))
+
+@question_templates.vectorize(physical_constant)
+def physical_constant_batch(vocab, rng, n):
+    values = rng.uniform(1.0, 10.0, (n, OPTION_COUNT)).round(4).tolist()
+    return ([f"What is the {w} constant approximately equal to?" for w in pick(vocab.words, rng, n)],
+            [[str(v) for v in row] for row in values], rng.integers(0, OPTION_COUNT, n).tolist())
+
+@question_templates.vectorize(travel_time)
+def travel_time_batch(vocab, rng, n):
+    speed = rng.integers(10, 101, n)
+    distance = rng.integers(100, 501, n)
+    hours = rng.uniform(1, 10, (n, OPTION_COUNT))
+    hours[:, 3] = distance / speed
+    return ([f"If a {w} is traveling at {s} mph, how long to travel {d} miles?"
+             for w, s, d in zip(pick(vocab.words, rng, n), speed.tolist(), distance.tolist())],
+            [[f"{h:.2f} hours" for h in row] for row in hours.tolist()], [3] * n)
+
+@question_templates.vectorize(next_number)
+def next_number_batch(vocab, rng, n):
+    a, b, c = rng.integers(1, 11, n), rng.integers(11, 21, n), rng.integers(21, 31, n)
+    return ([f"What is the next number: {x}, {y}, {z}, __?" for x, y, z in zip(a.tolist(), b.tolist(), c.tolist())],
+            *number_options(rng, 31, 50, n))
+
+@question_templates.vectorize(odd_word_out)
+def odd_word_out_batch(vocab, rng, n):
+    return ([f"Which word doesn't belong: {a}, {b}, {c}, {d}?" for a, b, c, d in pick(vocab.words, rng, n, 4)],
+            *pick_options(vocab.words, rng, n))
+
+@question_templates.vectorize(bracket_arithmetic)
+def bracket_arithmetic_batch(vocab, rng, n):
+    a, b, c = rng.integers(1, 11, (3, n))
+    return ([f"Solve: ({x} + {y}) × {z}" for x, y, z in zip(a.tolist(), b.tolist(), c.tolist())],
+            *computed_options(rng, 10, 100, ((a + b) * c).astype("U"), n))
+
+@question_templates.vectorize(word_riddle)
+def word_riddle_batch(vocab, rng, n):
+    return ([f"What is the {a} of {b} in {c}?"
+             for (a, b), c in zip(pick(vocab.words, rng, n, 2), pick(vocab.country, rng, n))],
+            *pick_options(vocab.titles, rng, n))
+
+def parse_opentdb_question(question):
+    """Convert one OpenTDB result into the quiz question format"""
+    q_text = html.unescape(question["question"])
+    correct = html.unescape(question["correct_answer"])
+    options = [html.unescape(opt) for opt in question["incorrect_answers"]]
+    options.append(correct)
+    random.shuffle(options)
+    return Question(q_text, options, options.index(correct), html.unescape(question.get("category", "")))
+
+def fetch_opentdb_questions(session, difficulty, amount, url=OPENTDB_URL):
+    """Fetch a batch of multiple-choice questions; returns [] when OpenTDB has none to give"""
+    difficulty_map = {
+        "Easy": "Easy",
+        "Medium": "Medium",
+        "Hard": "Hard"
+    }
+    params = {
+        "amount": amount,
+        "difficulty": difficulty_map.get(difficulty, "Medium"),
+        "type": "multiple"
+    }
+    response = session.get(url, params=params, timeout=5)
+    data = response.json()
+
+    if data["response_code"] == 0:
+        return [parse_opentdb_question(q) for q in data["results"]]
+    return []
+
+class ConnectivityMonitor:
+    """Cached online state, re-probed in the background, with a circuit breaker for fetch failures"""
+
+    def __init__(self, probe, ttl=30.0, offline_retry=5.0, max_backoff=300.0,
+                 failure_threshold=3, cooldown=30.0):
+        self.probe = probe
+        self.ttl = ttl
+        self.offline_retry = offline_retry
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = None
+        self.checked_at = 0.0
+        self.retry_after = 0.0
+        self.failures = 0
+        self.circuit_open_until = 0.0
+        self.circuit_trips = 0
+        self.hits = 0
+        self.misses = 0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def online(self):
+        """Instant, non-blocking view of connectivity; stale state triggers a background probe"""
+        now = time.monotonic()
+
+        if self.state is not None and now - self.checked_at < self.retry_after:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.refresh()
+        return bool(self.state) and now >= self.circuit_open_until
+
+    def refresh(self):
+        with self.lock:
+
+            if self.probing:
+                return
+            self.probing = True
+        threading.Thread(target=self._probe, daemon=True).start()
+
+    def _probe(self):
+        result = self.probe()
+
+        with self.lock:
+
+            if result:
+                self.retry_after = self.ttl
+            elif self.state is False:
+                self.retry_after = min(self.retry_after * 2, self.max_backoff)
+            else:
+                self.retry_after = self.offline_retry
+            self.state = result
+            self.checked_at = time.monotonic()
+            self.probing = False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.circuit_trips = 0
+
+    def record_failure(self):
+        """Count a failed fetch; repeated failures open the circuit for a growing cooldown"""
+
+        with self.lock:
+            self.failures += 1
+
+            if self.failures >= self.failure_threshold:
+                cooldown = min(self.cooldown * 2 ** self.circuit_trips, self.max_backoff)
+                self.circuit_open_until = time.monotonic() + cooldown
+                self.circuit_trips += 1
+                self.failures = 0
+
+    def stats(self):
+        return {
+            "online": bool(self.state),
+            "circuit_open": time.monotonic() < self.circuit_open_until,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+class OnlineQuestionCache:
+    """Fetched OpenTDB questions kept in a shelve for offline replay, evicted least recently used first"""
+
+    def __init__(self, storage_path, max_entries=5000):
+        self.path = os.path.join(storage_path, "online_questions")
+        self.max_entries = max_entries
+        self.db = None
+        self.index = OrderedDict()
+        self.by_difficulty = {}
+        self.closed = False
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(question):
+        return hashlib.sha1(question.text.encode("utf-8")).hexdigest()
+
+    def _open(self):
+
+        if self.db is not None:
+            return
+        import shelve
+        self.db = shelve.open(self.path)
+        for key, difficulty in self.db.get("__index__", []):
+            self.index[key] = difficulty
+            self.by_difficulty.setdefault(difficulty, OrderedDict())[key] = None
+
+    def _touch(self, key, difficulty):
+        self.index[key] = difficulty
+        self.index.move_to_end(key)
+        keys = self.by_difficulty.setdefault(difficulty, OrderedDict())
+        keys[key] = None
+        keys.move_to_end(key)
+
+    def _evict(self):
+        while len(self.index) > self.max_entries:
+            key, difficulty = self.index.popitem(last=False)
+            self.by_difficulty[difficulty].pop(key, None)
+            del self.db[key]
+
+    def add_many(self, difficulty, questions):
+        """Store fetched questions and return only the ones not already cached"""
+
+        with self.lock:
+
+            if self.closed:
+                return questions
+
+            try:
+                self._open()
+                new = []
+                for question in questions:
+                    key = self.key(question)
+
+                    if key not in self.index:
+                        self.db[key] = question.to_row()
+                        new.append(question)
+                    self._touch(key, difficulty)
+                self._evict()
+                self.db["__index__"] = list(self.index.items())
+                return new
+
+            except Exception as e:
+                print(f"Error caching internet questions: {e}")
+                return questions
+
+    def take(self, difficulty):
+        """Return the least recently used cached question for a difficulty, or None"""
+
+        with self.lock:
+
+            if self.closed:
+                return None
+
+            try:
+                self._open()
+                keys = self.by_difficulty.get(difficulty)
+
+                if not keys:
+                    return None
+                key = next(iter(keys))
+                self._touch(key, difficulty)
+                return Question(*self.db[key])
+
+            except Exception as e:
+                print(f"Error reading cached questions: {e}")
+                return None
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+
+            if self.db is not None:
+                self.db["__index__"] = list(self.index.items())
+                self.db.close()
+                self.db = None
+
+class OpenTDBPrefetcher:
+    """Per-difficulty buffers of OpenTDB questions, filled on a worker thread"""
+
+    def __init__(self, root, connectivity=None, cache=None, batch_size=OPENTDB_BATCH_SIZE, low_water=10,
+                 min_interval=OPENTDB_MIN_INTERVAL, url=OPENTDB_URL):
+        self.root = root
+        self.connectivity = connectivity
+        self.cache = cache
+        self.batch_size = batch_size
+        self.low_water = low_water
+        self.min_interval = min_interval
+        self.url = url
+        self.http_session = None
+        self.buffers = {name: deque() for name in ("Easy", "Medium", "Hard")}
+        self.pending = set()
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.last_request = 0.0
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+        self.root.after(100, self._poll)
+
+    @property
+    def session(self):
+
+        if self.http_session is None:
+            self.http_session = new_http_session()
+        return self.http_session
+
+    def request(self, difficulty):
+        """Ask the worker for another batch if the buffer is running low"""
+
+        if difficulty not in self.buffers or difficulty in self.pending:
+            return
+
+        if self.connectivity is not None and not self.connectivity.online:
+            return
+
+        if len(self.buffers[difficulty]) < self.low_water:
+            self.pending.add(difficulty)
+            self.requests.put(difficulty)
+
+    def pop(self, difficulty):
+        """Return a buffered question without blocking, or None if the buffer is empty"""
+        buffer = self.buffers.get(difficulty)
+        question = buffer.popleft() if buffer else None
+        self.request(difficulty)
+        return question
+
+    def trim(self):
+        """Drop buffered questions beyond low_water; they stay in the online cache on disk"""
+        trimmed = False
+        for buffer in self.buffers.values():
+            while len(buffer) > self.low_water:
+                buffer.pop()
+                trimmed = True
+        return trimmed
+
+    def stop(self):
+        self.requests.put(None)
+
+    def _poll(self):
+        while True:
+
+            try:
+                difficulty, questions = self.results.get_nowait()
+
+            except queue.Empty:
+                break
+            self.buffers[difficulty].extend(questions)
+            self.pending.discard(difficulty)
+        self.root.after(100, self._poll)
+
+    def _record(self, success):
+
+        if self.connectivity is None:
+            return
+
+        if success:
+            self.connectivity.record_success()
+        else:
+            self.connectivity.record_failure()
+
+    def _run(self):
+        while True:
+            difficulty = self.requests.get()
+
+            if difficulty is None:
+                return
+            wait = self.last_request + self.min_interval - time.monotonic()
+
+            if wait > 0:
+                time.sleep(wait)
+            self.last_request = time.monotonic()
+
+            try:
+                questions = fetch_opentdb_questions(self.session, difficulty, self.batch_size, self.url)
+                self._record(True)
+
+                if self.cache is not None:
+                    questions = self.cache.add_many(difficulty, questions)
+
+            except Exception as e:
+                print(f"Error fetching internet questions: {e}")
+                questions = []
+                self._record(False)
+            self.results.put((difficulty, questions))
+
+class QuestionBankSnapshot:
+    """Pre-built question banks stored in a shelve, keyed by generator version and seed
+
+    Without an explicit seed, the seed of the last offline build (recorded under ACTIVE_SEED_KEY) is used.
+    """
+    ACTIVE_SEED_KEY = "active_seed"
+
+    def __init__(self, storage_path, version=QUESTION_GENERATOR_VERSION, seed=None):
+        self.path = os.path.join(storage_path, "question_bank")
+        self.version = version
+        self.seed = self.active_seed() if seed is None else seed
+
+    def active_seed(self):
+
+        try:
+            import shelve
+
+            with shelve.open(self.path, flag="r") as db:
+                return db.get(self.ACTIVE_SEED_KEY, DEFAULT_BANK_SEED)
+
+        except Exception:
+            return DEFAULT_BANK_SEED
+
+    def activate(self):
+        """Make this snapshot's seed the one the app and server load"""
+
+        try:
+            import shelve
+
+            with shelve.open(self.path) as db:
+                db[self.ACTIVE_SEED_KEY] = self.seed
+
+        except Exception as e:
+            print(f"Error saving question bank: {e}")
+
+    def key(self, difficulty):
+        return f"v{self.version}:seed{self.seed}:{difficulty}"
+
+    def load(self, difficulty):
+        """Return the stored bank for a difficulty, or None if there is no current snapshot"""
+
+        try:
+            import shelve
+
+            with shelve.open(self.path, flag="r") as db:
+                return db.get(self.key(difficulty))
+
+        except Exception:
+            return None
+
+    def save(self, difficulty, state):
+        """Store a QuestionBank state and drop entries written by older generator versions"""
+        prefix = f"v{self.version}:"
+
+        try:
+            import shelve
+
+            with shelve.open(self.path) as db:
+                for key in [k for k in db.keys() if not k.startswith(prefix) and k != self.ACTIVE_SEED_KEY]:
+                    del db[key]
+                db[self.key(difficulty)] = state
+
+        except Exception as e:
+            print(f"Error saving question bank: {e}")
+
+def chunk_seed(seed, difficulty, chunk):
+    """Seed for one chunk of a bank; independent of how chunks are spread over workers"""
+    digest = hashlib.sha256(f"{seed}:{difficulty}:{chunk}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+def generate_seeded_chunk(fake, difficulty, seed, chunk, count=BANK_CHUNK_SIZE):
+    value = chunk_seed(seed, difficulty, chunk)
+    fake.seed_instance(value)
+    return question_templates.generate(difficulty, count, fake, random.Random(value))
+
+worker_fake = None
+
+def build_bank_part(difficulty, seed, first_chunk, last_chunk, size, vectorized=False):
+    """Worker entry point: generate chunks [first_chunk, last_chunk) of a bank"""
+    global worker_fake
+    start = time.perf_counter()
+
+    if vectorized:
+        count = min(last_chunk * BANK_CHUNK_SIZE, size) - first_chunk * BANK_CHUNK_SIZE
+        bank = QuestionBank(
+            question_templates.generate_batch(difficulty, count, chunk_seed(seed, difficulty, first_chunk))
+        )
+        return bank.to_state(), os.getpid(), time.perf_counter() - start
+
+    if worker_fake is None:
+        worker_fake = new_faker()
+    bank = QuestionBank()
+    for chunk in range(first_chunk, last_chunk):
+        count = min(BANK_CHUNK_SIZE, size - chunk * BANK_CHUNK_SIZE)
+        bank.extend(generate_seeded_chunk(worker_fake, difficulty, seed, chunk, count))
+    return bank.to_state(), os.getpid(), time.perf_counter() - start
+
+def build_question_bank(difficulty, size, seed, executor=None, worker_stats=None, vectorized=False):
+    """Generate a reproducible, de-duplicated bank; the result only depends on size, seed and vectorized"""
+    chunks = math.ceil(size / BANK_CHUNK_SIZE)
+    step = max(1, min(1000, chunks // 64))
+    ranges = [(first, min(first + step, chunks)) for first in range(0, chunks, step)]
+    args = (
+        [difficulty] * len(ranges),
+        [seed] * len(ranges),
+        [first for first, _ in ranges],
+        [last for _, last in ranges],
+        [size] * len(ranges),
+        [vectorized] * len(ranges)
+    )
+    parts = executor.map(build_bank_part, *args) if executor is not None else map(build_bank_part, *args)
+    bank = QuestionBank()
+    seen = set()
+    part_bank = QuestionBank()
+    for state, pid, elapsed in parts:
+        part_bank.load_state(state)
+        for i in range(len(part_bank)):
+            question = part_bank[i]
+            key = (question.text, question.options)
+
+            if key not in seen:
+                seen.add(key)
+                bank.append(question)
+
+        if worker_stats is not None:
+            stats = worker_stats.setdefault(pid, [0, 0.0])
+            stats[0] += len(part_bank)
+            stats[1] += elapsed
+    return bank
+
+class ImportedQuestionStore:
+    """Imported questions stored in a shelve as fixed-size QuestionBank batches per difficulty"""
+
+    def __init__(self, storage_path):
+        self.path = os.path.join(storage_path, "imported_questions")
+
+    def batch_count(self, difficulty):
+
+        try:
+            import shelve
+
+            with shelve.open(self.path, flag="r") as db:
+                return db.get(f"{difficulty}:batches", 0)
+
+        except Exception:
+            return 0
+
+    def write_batch(self, difficulty, bank):
+        import shelve
+
+        with shelve.open(self.path) as db:
+            batch = db.get(f"{difficulty}:batches", 0)
+            db[f"{difficulty}:{batch}"] = bank.to_state()
+            db[f"{difficulty}:batches"] = batch + 1
+
+    def load_batch(self, difficulty, batch):
+
+        try:
+            import shelve
+
+            with shelve.open(self.path, flag="r") as db:
+                return db.get(f"{difficulty}:{batch}")
+
+        except Exception as e:
+            print(f"Error loading imported questions: {e}")
+            return None
+
+class SQLiteQuestionStore:
+    """Optional SQLite question store with indexed random sampling by difficulty and category
+
+    Each row carries dense ordinals, seq within its difficulty and category_seq within its difficulty and
+    category, numbered 0..n-1 in id order, so a uniform draw is one index lookup however the ids interleave.
+    """
+
+    def __init__(self, storage_path):
+        self.path = os.path.join(storage_path, "questions.sqlite3")
+        self.db = None
+        self.counts = {}
+
+    def connect(self):
+
+        if self.db is not None:
+            return self.db
+        import sqlite3
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript("""
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS questions (
+                id INTEGER PRIMARY KEY,
+                difficulty TEXT NOT NULL,
+                category TEXT NOT NULL,
+                source TEXT NOT NULL,
+                text TEXT NOT NULL,
+                options TEXT NOT NULL,
+                answer INTEGER NOT NULL,
+                seq INTEGER,
+                category_seq INTEGER,
+                template TEXT NOT NULL DEFAULT ''
+            );
+            CREATE TEMP TABLE IF NOT EXISTS used (
+                session TEXT NOT NULL,
+                question_id INTEGER NOT NULL,
+                PRIMARY KEY (session, question_id)
+            ) WITHOUT ROWID;
+        """)
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(questions)")}
+
+        if "seq" not in columns:
+
+            with self.db:
+                self.db.execute("ALTER TABLE questions ADD COLUMN seq INTEGER")
+                self.db.execute("ALTER TABLE questions ADD COLUMN category_seq INTEGER")
+                for (difficulty,) in self.db.execute("SELECT DISTINCT difficulty FROM questions").fetchall():
+                    self.renumber(difficulty)
+
+        if "template" not in columns:
+            self.db.execute("ALTER TABLE questions ADD COLUMN template TEXT NOT NULL DEFAULT ''")
+        self.db.executescript("""
+            DROP INDEX IF EXISTS questions_difficulty;
+            DROP INDEX IF EXISTS questions_difficulty_category;
+            CREATE INDEX IF NOT EXISTS questions_difficulty_seq ON questions (difficulty, seq);
+            CREATE INDEX IF NOT EXISTS questions_difficulty_category_seq ON questions (difficulty, category, category_seq);
+        """)
+        return self.db
+
+    def renumber(self, difficulty):
+        """Rebuild the dense ordinals of one difficulty, e.g. after deleting rows; runs in the caller's transaction"""
+        category_next = {}
+        updates = []
+        rows = self.db.execute("SELECT id, category FROM questions WHERE difficulty = ? ORDER BY id", (difficulty,))
+        for seq, (question_id, category) in enumerate(rows.fetchall()):
+            category_seq = category_next.get(category, 0)
+            category_next[category] = category_seq + 1
+            updates.append((seq, category_seq, question_id))
+        self.db.executemany("UPDATE questions SET seq = ?, category_seq = ? WHERE id = ?", updates)
+
+    def _next_seq(self, difficulty, category=None):
+        """One past the highest stored ordinal, answered from the index"""
+
+        if category is None:
+            row = self.db.execute("SELECT MAX(seq) FROM questions WHERE difficulty = ?", (difficulty,)).fetchone()
+        else:
+            row = self.db.execute(
+                "SELECT MAX(category_seq) FROM questions WHERE difficulty = ? AND category = ?", (difficulty, category)
+            ).fetchone()
+        return 0 if row[0] is None else row[0] + 1
+
+    def write_batch(self, difficulty, bank, source="imported"):
+        db = self.connect()
+
+        with db:
+            seq = self._next_seq(difficulty)
+            category_next = {}
+            rows = []
+            for q in bank:
+
+                if q.category not in category_next:
+                    category_next[q.category] = self._next_seq(difficulty, q.category)
+                rows.append((difficulty, q.category, source, q.text, json.dumps(q.options), q.answer,
+                             seq, category_next[q.category], q.template))
+                seq += 1
+                category_next[q.category] += 1
+            db.executemany(
+                "INSERT INTO questions (difficulty, category, source, text, options, answer, seq, category_seq, template) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        self.counts.clear()
+
+    def replace_source(self, difficulty, source, bank):
+        """Swap out all questions of one source for a difficulty, e.g. a rebuilt generated bank"""
+        db = self.connect()
+
+        with db:
+            db.execute("DELETE FROM questions WHERE difficulty = ? AND source = ?", (difficulty, source))
+            self.renumber(difficulty)
+        self.write_batch(difficulty, bank, source)
+
+    def count(self, difficulty, category=None):
+        """Cached number of questions for a difficulty/category"""
+        key = (difficulty, category)
+
+        if key not in self.counts:
+            self.connect()
+            self.counts[key] = self._next_seq(difficulty, category)
+        return self.counts[key]
+
+    def sample(self, difficulty, category=None, session=None, attempts=8):
+        """Draw a uniformly random question by dense ordinal; skips questions the session already used"""
+        count = self.count(difficulty, category)
+
+        if not count:
+            return None
+        db = self.connect()
+        where = "difficulty = ?" + (" AND category = ?" if category is not None else "")
+        params = [difficulty] + ([category] if category is not None else [])
+        column = "seq" if category is None else "category_seq"
+        for _ in range(attempts):
+            row = db.execute(
+                f"SELECT id, text, options, answer, category, template FROM questions WHERE {where} AND {column} = ?",
+                params + [random.randrange(count)]
+            ).fetchone()
+
+            if row is None:
+                continue
+
+            if session is None:
+                return self._question(row)
+
+            if db.execute("SELECT 1 FROM used WHERE session = ? AND question_id = ?", (session, row[0])).fetchone() is None:
+                db.execute("INSERT INTO used (session, question_id) VALUES (?, ?)", (session, row[0]))
+                return self._question(row)
+        unused = f"{where} AND id NOT IN (SELECT question_id FROM used WHERE session = ?)"
+        remaining = db.execute(f"SELECT COUNT(*) FROM questions WHERE {unused}", params + [session]).fetchone()[0]
+
+        if not remaining:
+            self.counts.clear()
+
+            if session is None:
+                return None
+            self.end_session(session)
+            return self.sample(difficulty, category, session, attempts)
+        row = db.execute(
+            f"SELECT id, text, options, answer, category, template FROM questions WHERE {unused} ORDER BY {column} LIMIT 1 OFFSET ?",
+            params + [session, random.randrange(remaining)]
+        ).fetchone()
+
+        if session is not None:
+            db.execute("INSERT INTO used (session, question_id) VALUES (?, ?)", (session, row[0]))
+        return self._question(row)
+
+    @staticmethod
+    def _question(row):
+        return Question(row[1], json.loads(row[2]), row[3], row[4], row[5])
+
+    def end_session(self, session):
+
+        if self.db is not None:
+            self.db.execute("DELETE FROM used WHERE session = ?", (session,))
+
+    def close(self):
+
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+def open_question_store(storage_path, choice=None):
+    """Return a SQLiteQuestionStore when the question_store setting (or an explicit choice, which is saved) is sqlite"""
+    settings = SettingsStore(storage_path)
+
+    if choice is not None:
+        settings.set("question_store", choice)
+    return SQLiteQuestionStore(storage_path) if settings.get("question_store") == "sqlite" else None
+
+class QuestionImporter:
+    """Streams question files into an ImportedQuestionStore or SQLiteQuestionStore in batches, counting rejected records"""
+    DIFFICULTIES = {"easy": "Easy", "medium": "Medium", "hard": "Hard"}
+
+    def __init__(self, store, batch_size=1000, default_difficulty=None):
+        self.store = store
+        self.batch_size = batch_size
+        self.default_difficulty = default_difficulty
+        self.buffers = {}
+        self.imported = {}
+        self.errors = {}
+        self.error_samples = []
+        self.records = 0
+
+    @staticmethod
+    def detect_format(path):
+        extension = os.path.splitext(path)[1].lower()
+
+        if extension == ".csv":
+            return "csv"
+
+        if extension in (".jsonl", ".ndjson"):
+            return "jsonl"
+        return "opentdb"
+
+    @staticmethod
+    def iter_jsonl(f):
+        """Yield one record per non-blank line; lines that are not JSON yield a ValueError to count"""
+        for line in f:
+
+            if line.strip():
+
+                try:
+                    yield json.loads(line)
+
+                except json.JSONDecodeError:
+                    yield ValueError("invalid JSON")
+
+    @staticmethod
+    def iter_csv(f):
+        """Rows with question, correct_answer/answer and incorrect_answer_N or option_N columns"""
+        for row in csv.DictReader(f):
+            row = {k: v for k, v in row.items() if k is not None}
+            record = {
+                "question": row.get("question", ""),
+                "difficulty": row.get("difficulty", ""),
+                "category": row.get("category", "")
+            }
+
+            if row.get("correct_answer"):
+                record["correct_answer"] = row["correct_answer"]
+                record["incorrect_answers"] = [v for k, v in sorted(row.items()) if k.startswith("incorrect_answer") and v]
+            else:
+                record["answer"] = row.get("answer", "")
+                record["options"] = [v for k, v in sorted(row.items()) if k.startswith("option") and v]
+            yield record
+
+    @staticmethod
+    def iter_opentdb(f, chunk_size=1 << 16):
+        """Yield the objects of an OpenTDB dump's "results" array (or a top-level array) without reading it whole"""
+        decoder = json.JSONDecoder()
+        buffer = ""
+        position = 0
+        in_array = False
+        while True:
+
+            if not in_array:
+                match = re.search(r'"results"\s*:\s*\[|^\s*\[', buffer)
+
+                if match:
+                    position = match.end()
+                    in_array = True
+
+            if in_array:
+                while True:
+                    while position < len(buffer) and buffer[position] in " \t\r\n,":
+                        position += 1
+
+                    if position >= len(buffer):
+                        break
+
+                    if buffer[position] == "]":
+                        return
+
+                    try:
+                        item, end = decoder.raw_decode(buffer, position)
+
+                    except json.JSONDecodeError:
+                        end = QuestionImporter.skip_record(buffer, position)
+
+                        if end is None:
+                            break
+                        yield ValueError("invalid JSON")
+                        position = end
+                        continue
+                    yield item
+                    position = end
+                buffer = buffer[position:]
+                position = 0
+            chunk = f.read(chunk_size)
+
+            if not chunk:
+
+                if in_array and buffer.strip():
+                    yield ValueError("truncated JSON array")
+                return
+            buffer += chunk
+
+    @staticmethod
+    def skip_record(buffer, position, max_record=1 << 20):
+        """Index just past a malformed array element starting at position, or None if more input is needed
+
+        Objects are skipped by matching braces outside strings; anything else, or an object that stays open
+        for more than max_record characters, resyncs at the next "{".
+        """
+
+        if position >= len(buffer):
+            return None
+
+        if buffer[position] == "{":
+            depth = 0
+            in_string = False
+            escaped = False
+            for index in range(position, len(buffer)):
+                char = buffer[index]
+
+                if in_string:
+
+                    if escaped:
+                        escaped = False
+                    elif char == "\\":
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '"':
+                    in_string = True
+                elif char == "{":
+                    depth += 1
+                elif char == "}":
+                    depth -= 1
+
+                    if depth == 0:
+                        return index + 1
+
+            if len(buffer) - position <= max_record:
+                return None
+        next_start = buffer.find("{", position + 1)
+
+        if next_start == -1:
+            closing = buffer.find("]", position + 1)
+            return None if closing == -1 else closing
+        return next_start
+
+    def normalize(self, record):
+        """Return (difficulty, Question) or raise ValueError naming the problem"""
+
+        if isinstance(record, ValueError):
+            raise record
+
+        if not isinstance(record, dict):
+            raise ValueError("record is not an object")
+        text = html.unescape(str(record.get("question", ""))).strip()
+
+        if not text:
+            raise ValueError("missing question")
+
+        if "correct_answer" in record:
+            answer = html.unescape(str(record["correct_answer"]))
+            options = [html.unescape(str(opt)) for opt in record.get("incorrect_answers", [])] + [answer]
+        else:
+            answer = html.unescape(str(record.get("answer", "")))
+            options = [html.unescape(str(opt)) for opt in record.get("options", [])]
+
+        if len(options) != OPTION_COUNT:
+            raise ValueError(f"needs exactly {OPTION_COUNT} options")
+
+        if len(set(options)) != OPTION_COUNT:
+            raise ValueError("duplicate options")
+
+        if answer not in options:
+            raise ValueError("answer not among options")
+        difficulty = self.DIFFICULTIES.get(str(record.get("difficulty", "")).lower(), self.default_difficulty)
+
+        if difficulty is None:
+            raise ValueError("unknown difficulty")
+        random.shuffle(options)
+        category = html.unescape(str(record.get("category", "")))
+        return difficulty, Question(text, options, options.index(answer), category)
+
+    def add(self, record):
+        self.records += 1
+
+        try:
+            difficulty, question = self.normalize(record)
+
+        except ValueError as e:
+            reason = str(e)
+            self.errors[reason] = self.errors.get(reason, 0) + 1
+
+            if len(self.error_samples) < 10:
+                self.error_samples.append((self.records, reason))
+            return
+        buffer = self.buffers.setdefault(difficulty, QuestionBank())
+        buffer.append(question)
+
+        if len(buffer) >= self.batch_size:
+            self.flush(difficulty)
+
+    def flush(self, difficulty):
+        """Write one buffered batch and start a fresh buffer so memory stays flat"""
+        buffer = self.buffers.pop(difficulty, None)
+
+        if not buffer:
+            return
+        self.store.write_batch(difficulty, buffer)
+        self.imported[difficulty] = self.imported.get(difficulty, 0) + len(buffer)
+
+    def run(self, path, fmt=None):
+        fmt = fmt or self.detect_format(path)
+        readers = {"csv": self.iter_csv, "jsonl": self.iter_jsonl, "opentdb": self.iter_opentdb}
+        start = time.perf_counter()
+
+        try:
+
+            with open(path, "r", encoding="utf-8", newline="" if fmt == "csv" else None) as f:
+                for record in readers[fmt](f):
+                    self.add(record)
+
+        finally:
+            for difficulty in list(self.buffers):
+                self.flush(difficulty)
+        elapsed = time.perf_counter() - start
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"Read {self.records} records ({size_mb:.1f} MB) in {elapsed:.2f}s: "
+              f"{self.records / elapsed:.0f} records/s, {size_mb / elapsed:.1f} MB/s")
+        for difficulty, count in sorted(self.imported.items()):
+            print(f"{difficulty}: {count} questions imported")
+        for reason, count in sorted(self.errors.items()):
+            print(f"rejected ({reason}): {count}")
+        for record_number, reason in self.error_samples:
+            print(f"  record {record_number}: {reason}")
+
+class NearDuplicateIndex:
+    """MinHash/LSH index over normalized question text that flags near-duplicate wording
+
+    Texts are lowercased and stripped of punctuation, then hashed as character 4-grams into a one-permutation
+    MinHash signature. Two texts count as near-duplicates when their estimated Jaccard similarity reaches the
+    threshold and they mention the same numbers, so "What is 5 + 7?" and "What is 5 + 8?" stay distinct.
+    """
+
+    MAX_CANDIDATES = 32
+
+    def __init__(self, threshold=0.8, bands=4, rows=6, shingle=4):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.shingle = shingle
+        self.size = bands * rows
+        self.signatures = array("I")
+        self.number_keys = array("I")
+        self.buckets = {}
+
+    def __len__(self):
+        return len(self.number_keys)
+
+    def signature(self, text):
+        """Return (minhash tuple, numbers key) for a question text
+
+        Each shingle hash lands in one of size bins and only the bin minimum is kept, so the cost is one pass
+        over the shingles; empty bins borrow from the next filled bin.
+        """
+        normalized = " ".join(re.sub(r"[^0-9a-z]+", " ", text.lower()).split())
+        numbers = " ".join(re.findall(r"\d+", normalized))
+        data = f" {normalized} ".encode("utf-8")
+        size = self.size
+        empty = 0xFFFFFFFF
+        minhash = [empty] * size
+        for i in range(max(1, len(data) - self.shingle + 1)):
+            h = (zlib.crc32(data[i:i + self.shingle]) * 0x9E3779B1) & 0xFFFFFFFF
+            b = h % size
+            v = h // size
+
+            if v < minhash[b]:
+                minhash[b] = v
+        for b in range(size):
+
+            if minhash[b] == empty:
+                for step in range(1, size):
+                    borrowed = minhash[(b + step) % size]
+
+                    if borrowed != empty:
+                        minhash[b] = borrowed + step
+                        break
+        return tuple(minhash), zlib.crc32(numbers.encode("utf-8"))
+
+    def band_keys(self, minhash, number_key):
+        rows = self.rows
+        return [hash((band, number_key, minhash[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+
+    def query(self, text, signature=None):
+        """Return the id of an indexed near-duplicate of text, or None
+
+        Only the most recent MAX_CANDIDATES entries of a bucket are compared, which bounds the cost when a
+        template fills one bucket with many similar but distinct questions.
+        """
+        minhash, number_key = signature or self.signature(text)
+        size = self.size
+        needed = self.threshold * size
+        checked = set()
+        for key in self.band_keys(minhash, number_key):
+            bucket = self.buckets.get(key)
+
+            if bucket is None:
+                continue
+            for entry in (bucket,) if isinstance(bucket, int) else bucket[-self.MAX_CANDIDATES:]:
+
+                if entry in checked or self.number_keys[entry] != number_key:
+                    continue
+                checked.add(entry)
+                stored = self.signatures[entry * size:(entry + 1) * size]
+
+                if sum(x == y for x, y in zip(minhash, stored)) >= needed:
+                    return entry
+        return None
+
+    def add(self, text, signature=None):
+        minhash, number_key = signature or self.signature(text)
+        entry = len(self.number_keys)
+        self.signatures.extend(minhash)
+        self.number_keys.append(number_key)
+        for key in self.band_keys(minhash, number_key):
+            bucket = self.buckets.get(key)
+
+            if bucket is None:
+                self.buckets[key] = entry
+            elif isinstance(bucket, int):
+                self.buckets[key] = [bucket, entry]
+            else:
+                bucket.append(entry)
+        return entry
+
+    def admit(self, text):
+        """Index text and return True unless it is a near-duplicate of something already indexed"""
+        signature = self.signature(text)
+
+        if self.query(text, signature) is not None:
+            return False
+        self.add(text, signature)
+        return True
+
+class QuestionSampler:
+    """Draws items from a growing list in shuffled order without repeats, reshuffling when exhausted"""
+
+    def __init__(self, items, rng=random):
+        self.items = items
+        self.rng = rng
+        self.deck = array("I")
+        self.cursor = 0
+
+    def _absorb(self):
+        """Deal items appended since the last draw into the undrawn part of the deck"""
+        for index in range(len(self.deck), len(self.items)):
+            self.deck.append(index)
+            swap = self.rng.randrange(self.cursor, len(self.deck))
+            self.deck[swap], self.deck[-1] = self.deck[-1], self.deck[swap]
+
+    def remaining(self):
+        self._absorb()
+        return len(self.deck) - self.cursor
+
+    def draw(self):
+        """Return the next unused item in O(1) amortized time, or None if there are no items"""
+        self._absorb()
+
+        if not self.deck:
+            return None
+
+        if self.cursor >= len(self.deck):
+            self.rng.shuffle(self.deck)
+            self.cursor = 0
+        index = self.deck[self.cursor]
+        self.cursor += 1
+        return self.items[index]
+
+class PermutationSampler:
+    """QuestionSampler with O(1) state for per-session decks over a shared pool
+
+    Walks a keyed Feistel permutation of range(len(items)) with a cursor, cycle-walking values that land past
+    the end. A new key is drawn when the order is exhausted or the pool changes size.
+    """
+    ROUNDS = 8
+
+    def __init__(self, items, rng=random):
+        self.items = items
+        self.rng = rng
+        self.size = 0
+        self.cursor = 0
+        self.keys = ()
+        self.half_bits = 1
+        self.mask = 1
+
+    def _rekey(self):
+        self.size = len(self.items)
+        self.cursor = 0
+        bits = max(2, (self.size - 1).bit_length())
+        self.half_bits = (bits + 1) // 2
+        self.mask = (1 << self.half_bits) - 1
+        self.keys = tuple(self.rng.getrandbits(64) for _ in range(self.ROUNDS))
+
+    def _permute(self, index):
+        half_bits, mask = self.half_bits, self.mask
+        while True:
+            left, right = index >> half_bits, index & mask
+            for key in self.keys:
+                mixed = ((right + key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+                left, right = right, left ^ ((((mixed >> 29) ^ key) * 0xBF58476D1CE4E5B9 >> 40) & mask)
+            index = (left << half_bits) | right
+
+            if index < self.size:
+                return index
+
+    def remaining(self):
+        return len(self.items) if len(self.items) != self.size else self.size - self.cursor
+
+    def draw(self):
+        """Return the next unused item, or None if there are no items"""
+
+        if not len(self.items):
+            return None
+
+        if len(self.items) != self.size or self.cursor >= self.size:
+            self._rekey()
+        index = self._permute(self.cursor)
+        self.cursor += 1
+        return self.items[index]
+
+def benchmark_sampler(sizes=(100, 1_000, 10_000, 100_000, 1_000_000), draws=10_000):
+    """Print per-draw latency of QuestionSampler for growing pool sizes"""
+    for size in sizes:
+        sampler = QuestionSampler(list(range(size)))
+        sampler.remaining()
+        start = time.perf_counter()
+        for _ in range(draws):
+            sampler.draw()
+        elapsed = time.perf_counter() - start
+        print(f"{size:>9} questions: {elapsed / draws * 1e9:8.0f} ns/draw")
+
+class QuestionPool:
+    """Question pool for one difficulty, filled lazily in small chunks"""
+    MAX_REJECTED_CHUNKS = 20
+    INDEX_STEP = 500
+
+    def __init__(self, generator, target=100, chunk_size=10, low_water=20, refill=100,
+                 max_size=10_000, snapshot=None, difficulty=None, imported=None):
+        self.generator = generator
+        self.questions = QuestionBank()
+        self.target = target
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.low_water = low_water
+        self.refill = refill
+        self.snapshot = snapshot
+        self.difficulty = difficulty
+        self.snapshot_checked = snapshot is None
+        self.imported = imported
+        self.import_batches = None
+        self.next_import_batch = 0
+        self.snapshot_pending = False
+        self.fake = None
+        self.rng = None
+        self.fill_scheduled = False
+        self.next_chunk = 0
+        self.rejected_chunks = 0
+        self.near_duplicates = NearDuplicateIndex()
+        self.indexed = 0
+        self.sampler = QuestionSampler(self.questions)
+
+    def load_snapshot(self):
+        """Take questions from the stored snapshot the first time the pool is used"""
+        self.snapshot_checked = True
+        stored = self.snapshot.load(self.difficulty)
+
+        if stored:
+            self.questions.load_state(stored)
+        else:
+            self.snapshot_pending = True
+
+    def index_step(self):
+        """Add the next INDEX_STEP loaded questions to the near-duplicate index"""
+        texts = self.questions.texts
+        end = min(self.indexed + self.INDEX_STEP, len(texts))
+        for index in range(self.indexed, end):
+            self.near_duplicates.add(texts[index])
+        self.indexed = end
+
+    def extend_admitted(self, questions):
+        """Append the questions that are not near-duplicates of anything already in the pool or drawn from it"""
+        questions = [question for question in questions if self.near_duplicates.admit(question.text)]
+        self.questions.extend(questions)
+        self.indexed = len(self.questions)
+        return questions
+
+    def imports_pending(self):
+        """True while imported batches are left and the pool has room for them; they do not count toward the target"""
+
+        if self.imported is None or self.snapshot_pending or len(self.questions) >= self.max_size:
+            return False
+
+        if self.import_batches is None:
+            self.import_batches = self.imported.batch_count(self.difficulty)
+        return self.next_import_batch < self.import_batches
+
+    def load_import_batch(self):
+        """Append the next imported batch for this difficulty, if any are left"""
+
+        if not self.imports_pending():
+            return False
+        state = self.imported.load_batch(self.difficulty, self.next_import_batch)
+        self.next_import_batch += 1
+
+        if state is None:
+            return False
+        self.extend_admitted(QuestionBank.from_state(state))
+        return True
+
+    def fill_chunk(self):
+        """Generate the next chunk of questions, up to the current target"""
+
+        if not self.snapshot_checked:
+            self.load_snapshot()
 
-    try:
-        base_path = sys._MEIPASS
+        if self.indexed < len(self.questions):
+            self.index_step()
+            return
 
-    except Exception:
-        base_path = os.path.abspath(".")
-    full_path = os.path.join(base_path, relative_path)
+        if self.load_import_batch():
+            return
+        count = min(self.chunk_size, self.target - len(self.questions))
 
-    if not os.path.exists(full_path):
-        raise FileNotFoundError(f"Resource not found: {full_path}")
-    return full_path
+        if count <= 0:
+            return
+
+        if self.fake is None:
+            self.fake = new_faker()
+            self.rng = random.Random()
+
+        if self.snapshot_pending:
+            questions = generate_seeded_chunk(self.fake, self.difficulty, self.snapshot.seed, self.next_chunk, count)
+            self.next_chunk += 1
+        else:
+            questions = self.generator(count, self.fake, self.rng)
+        questions = self.extend_admitted(questions)
+        self.rejected_chunks = 0 if questions else self.rejected_chunks + 1
+
+        if self.rejected_chunks >= self.MAX_REJECTED_CHUNKS and self.questions:
+            self.rejected_chunks = 0
+            self.target = len(self.questions)
+
+        if self.snapshot_pending and len(self.questions) >= DEFAULT_BANK_SIZE:
+            self.snapshot_pending = False
+            self.fake.seed_instance(self.rng.getrandbits(64))
+            self.snapshot.save(self.difficulty, self.questions.to_state(DEFAULT_BANK_SIZE))
+
+    def needs_fill(self):
+        return len(self.questions) < self.target or self.indexed < len(self.questions) or self.imports_pending()
+
+    def fill_in_background(self, root):
+        """Keep filling (and indexing) the pool one chunk per Tk idle callback until the target is reached"""
+
+        if self.fill_scheduled or not self.needs_fill():
+            return
+
+        if root is None:
+            while self.needs_fill():
+                self.fill_chunk()
+            return
+        self.fill_scheduled = True
+        root.after_idle(self._fill_step, root)
+
+    def _fill_step(self, root):
+        self.fill_scheduled = False
+        self.fill_chunk()
+        self.fill_in_background(root)
+
+    def trim(self):
+        """Halve the pool (keeping the oldest questions) and stop it regrowing; False once at the floor"""
+        keep = max(self.low_water * 2, len(self.questions) // 2)
+
+        if len(self.questions) <= keep:
+            return False
+        self.questions.load_state(self.questions.to_state(keep))
+        self.sampler = QuestionSampler(self.questions)
+        self.target = self.max_size = keep
+        self.import_batches = self.next_import_batch
+        self.near_duplicates = NearDuplicateIndex()
+        self.indexed = 0
+        return True
+
+    def check_low_water(self, remaining, root):
+        """Raise the target and refill in the background when few unused questions are left"""
+
+        if remaining < self.low_water and len(self.questions) < self.max_size:
+            self.target = min(max(self.target, len(self.questions)) + self.refill, self.max_size)
+            self.fill_in_background(root)
+        elif self.indexed < len(self.questions):
+            self.fill_in_background(root)
+
+class SessionJournal:
+    """Append-only JSON Lines record of the current session, with a binary offset index for paging"""
+
+    def __init__(self, storage_path):
+        self.path = os.path.join(storage_path, "session_journal.jsonl")
+        self.index_path = os.path.join(storage_path, "session_journal.idx")
+        self.file = None
+        self.index_file = None
+        self.offsets = array("Q")
+
+    def _append(self, record):
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        offset = self.file.tell()
+        self.file.write(line)
+        self.file.flush()
+        return offset
+
+    def start(self, difficulty):
+        """Begin a new session, replacing the previous journal"""
+        self.close()
+        self.file = open(self.path, "wb")
+        self.index_file = open(self.index_path, "wb")
+        self.offsets = array("Q")
+        self._append({"type": "start", "difficulty": difficulty, "time": time.time()})
+
+    def write_question(self, index, history_item, normal_count, score):
+        offset = self._append({
+            "type": "question",
+            "index": index,
+            "question": history_item["data"].to_row(),
+            "is_googly": history_item["is_googly"],
+            "order": history_item["order"],
+            "normal_count": normal_count,
+            "score": score
+        })
+        self.offsets.append(offset)
+        self.index_file.write(array("Q", [offset]).tobytes())
+        self.index_file.flush()
+
+    def write_answer(self, index, option_idx, score):
+        self._append({"type": "answer", "index": index, "answer": option_idx, "score": score})
+
+    def end(self):
+        """Mark the session finished so it is not offered for resuming"""
+
+        if self.file is not None:
+            self._append({"type": "end"})
+        self.close()
+
+    def close(self):
+        for f in (self.file, self.index_file):
+
+            if f is not None:
+                f.close()
+        self.file = None
+        self.index_file = None
+
+    @staticmethod
+    def _entry(record):
+        return {
+            "data": Question(*record["question"]),
+            "is_googly": record["is_googly"],
+            "order": tuple(record["order"]),
+            "user_answer": None
+        }
+
+    def _read_records(self, f, offset, count=None):
+        """Read question records from offset, attaching the answer that follows each one"""
+        f.seek(offset)
+        records = []
+        for line in f:
+            record = json.loads(line)
+
+            if record["type"] == "question":
+
+                if count is not None and len(records) == count:
+                    break
+                records.append((record, self._entry(record)))
+            elif record["type"] == "answer" and records and records[-1][0]["index"] == record["index"]:
+                records[-1][1]["user_answer"] = record["answer"]
+            elif record["type"] == "end":
+                records.append((record, None))
+                break
+        return records
+
+    def read_entry(self, index):
+        """Page one older history entry back in from disk"""
+
+        with open(self.path, "rb") as f:
+            return self._read_records(f, self.offsets[index], 1)[0][1]
+
+    def resume(self, window):
+        """Return the state of an unfinished session from the journal's tail, or None"""
+
+        try:
+
+            with open(self.index_path, "rb") as f:
+                offsets = array("Q", f.read())
+
+            if not offsets:
+                return None
+
+            with open(self.path, "rb") as f:
+                start = json.loads(f.readline())
+                records = self._read_records(f, offsets[max(0, len(offsets) - window)])
+
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error reading session journal: {e}")
+            return None
+
+        if not records or records[-1][1] is None:
+            return None
+        last_record = records[-1][0]
+        score = last_record["score"]
+
+        with open(self.path, "rb") as f:
+            f.seek(offsets[-1])
+            for line in f:
+                record = json.loads(line)
+
+                if record["type"] == "answer":
+                    score = record["score"]
+        self.offsets = offsets
+        self.file = open(self.path, "ab")
+        self.index_file = open(self.index_path, "ab")
+        first_index = len(offsets) - len(records)
+        return {
+            "difficulty": start["difficulty"],
+            "score": score,
+            "normal_count": last_record["normal_count"],
+            "length": len(offsets),
+            "recent": {first_index + i: entry for i, (_, entry) in enumerate(records)}
+        }
+
+class SessionHistory:
+    """Question history; with a journal only the most recent entries stay in memory"""
+
+    def __init__(self, journal=None, window=50):
+        self.journal = journal
+        self.window = window
+        self.recent = {}
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        history_item = self.recent.get(index)
+
+        if history_item is None:
+
+            if not 0 <= index < self.length or self.journal is None:
+                raise IndexError(index)
+            history_item = self.journal.read_entry(index)
+        return history_item
+
+    def restore(self, length, recent):
+        self.length = length
+        self.recent = dict(recent)
+
+    def append(self, history_item, normal_count, score):
+        index = self.length
+        self.recent[index] = history_item
+        self.length += 1
+
+        if self.journal is not None:
+            self.journal.write_question(index, history_item, normal_count, score)
+            while len(self.recent) > self.window:
+                del self.recent[next(iter(self.recent))]
+
+    def trim(self, min_window=10):
+        """Halve the in-memory window; older entries are re-read from the journal. Needs a journal"""
+
+        if self.journal is None or self.window <= min_window:
+            return False
+        self.window = max(min_window, self.window // 2)
+        while len(self.recent) > self.window:
+            del self.recent[next(iter(self.recent))]
+        return True
+
+    def record_answer(self, index, option_idx, score):
+        self[index]["user_answer"] = option_idx
+
+        if self.journal is not None:
+            self.journal.write_answer(index, option_idx, score)
+
+class QuizEngine:
+    """Quiz rules and state without widgets: Googly scheduling, question selection, scoring and history"""
+    GOOGLY_EVERY = 5
+
+    HISTORY_WINDOW = 50
+
+    session_ids = itertools.count(1)
+
+    def __init__(self, pools, online_sources=(), root=None, journal=None, store=None, stats=None,
+                 private_decks=False):
+        self.pools = pools
+        self.decks = {} if private_decks else None
+        self.online_sources = online_sources
+        self.root = root
+        self.journal = journal
+        self.store = store
+        self.stats = stats
+        self.session_id = None
+        self.staged = None
+        self.staged_hits = 0
+        self.staged_misses = 0
+        self.shown_index = None
+        self.shown_at = 0.0
+        self.answered = 0
+        self.score = 0
+        self.current_question_index = 0
+        self.selected_difficulty = None
+        self.normal_count_since_googly = 0
+        self.question_history = SessionHistory()
+
+    def start(self, difficulty):
+
+        if self.decks is not None:
+            self.decks = {}
+        self.selected_difficulty = difficulty
+        self.score = 0
+        self.answered = 0
+        self.staged = None
+        self.shown_index = None
+        self.current_question_index = 0
+        self.normal_count_since_googly = 0
+
+        if self.journal is not None:
+            self.journal.start(difficulty)
+        self.question_history = SessionHistory(self.journal, self.HISTORY_WINDOW)
+        self.start_session()
+
+    def start_session(self):
+        """Begin tracking used questions; pools only pre-fill when there is no SQLite store"""
+
+        if self.store is not None:
+
+            if self.session_id is not None:
+                self.store.end_session(self.session_id)
+            self.session_id = f"{os.getpid()}-{next(self.session_ids)}"
+            return
+        self.pools[self.selected_difficulty].fill_in_background(self.root)
+        self.pools["Googly"].fill_in_background(self.root)
+
+    def resume(self, state):
+        """Continue an unfinished session from SessionJournal.resume()"""
+        self.selected_difficulty = state["difficulty"]
+        self.score = state["score"]
+        self.normal_count_since_googly = state["normal_count"]
+        self.question_history = SessionHistory(self.journal, self.HISTORY_WINDOW)
+        self.question_history.restore(state["length"], state["recent"])
+        self.current_question_index = state["length"] - 1
+        self.staged = None
+        self.shown_index = None
+        self.answered = state["length"] - (self.question_history[self.current_question_index]["user_answer"] is None)
+        self.start_session()
+
+    def end(self):
+        self.staged = None
+
+        if self.stats is not None:
+            self.stats.record_session(self.selected_difficulty, self.score, self.answered)
+            self.answered = 0
+
+        if self.journal is not None:
+            self.journal.end()
+
+        if self.store is not None and self.session_id is not None:
+            self.store.end_session(self.session_id)
+            self.session_id = None
+
+    def current(self):
+        """Return (history item, is_new), drawing a new question when past the end of history
+
+        The last question also counts as new while it is unanswered, e.g. after resuming.
+        """
+
+        if self.current_question_index < len(self.question_history):
+            history_item = self.question_history[self.current_question_index]
+            is_pending = (history_item["user_answer"] is None
+                          and self.current_question_index == len(self.question_history) - 1)
+
+            if is_pending:
+                self.mark_shown()
+            return history_item, is_pending
+        history_item, self.staged = self.staged, None
+
+        if history_item is None:
+            self.staged_misses += 1
+            history_item = self.new_item()
+        else:
+            self.staged_hits += 1
+
+        if history_item["is_googly"]:
+            self.normal_count_since_googly = 0
+        elif self.normal_count_since_googly == self.GOOGLY_EVERY:
+            self.normal_count_since_googly = 1
+        else:
+            self.normal_count_since_googly += 1
+        self.question_history.append(history_item, self.normal_count_since_googly, self.score)
+        self.mark_shown()
+        return history_item, True
+
+    def new_item(self):
+        """Decide Googly or normal, draw the question and shuffle its options, without committing anything"""
+        is_googly_round = self.normal_count_since_googly == self.GOOGLY_EVERY
+
+        if is_googly_round and not self.pools["Googly"].questions and self.store is None:
+            is_googly_round = False
+        return {
+            "data": self.draw_question(is_googly_round),
+            "is_googly": is_googly_round,
+            "order": random.choice(OPTION_ORDERS),
+            "user_answer": None
+        }
+
+    def stage_next(self):
+        """Prepare the question Next will show while the player reads feedback; current() commits it"""
+        last = len(self.question_history) - 1
+
+        if (self.staged is None and self.current_question_index == last
+                and self.question_history[last]["user_answer"] is not None):
+            self.staged = self.new_item()
+
+    def staging_stats(self):
+        total = self.staged_hits + self.staged_misses
+        return {
+            "hits": self.staged_hits,
+            "misses": self.staged_misses,
+            "hit_rate": self.staged_hits / total if total else 0.0
+        }
+
+    def register_memory(self, accountant):
+        """Account question pools (trimmed last) and the in-memory history window"""
+        for name, pool in sorted(self.pools.items()):
+            accountant.register(
+                f"questions:{name}", lambda pool=pool: (pool.questions, pool.sampler, pool.near_duplicates),
+                pool.trim, priority=2
+            )
+        accountant.register(
+            "history", lambda: (self.question_history.recent, self.staged),
+            lambda: self.question_history.trim(), priority=1
+        )
+
+    def mark_shown(self):
+        """Start the response timer the first time the current question is shown"""
+
+        if self.shown_index != self.current_question_index:
+            self.shown_index = self.current_question_index
+            self.shown_at = time.perf_counter()
+
+    @metrics.timed("draw_question")
+    def draw_question(self, is_googly_round):
+        """Take an online question for normal rounds if one is ready, else draw from the local pool"""
+
+        if not is_googly_round:
+            for source in self.online_sources:
+                question_data = source(self.selected_difficulty)
+
+                if (question_data is not None
+                        and self.pools[self.selected_difficulty].near_duplicates.admit(question_data.text)):
+                    return question_data
+        source = "Googly" if is_googly_round else self.selected_difficulty
+
+        if self.store is not None:
+            question_data = self.store.sample(source, session=self.session_id)
+
+            if question_data is not None:
+                return question_data
+        pool = self.pools[source]
+
+        if not pool.questions:
+            pool.fill_chunk()
+        sampler = pool.sampler
+
+        if self.decks is not None:
+            sampler = self.decks.get(source)
+
+            if sampler is None:
+                sampler = self.decks[source] = PermutationSampler(pool.questions)
+        question_data = sampler.draw()
+        pool.check_low_water(sampler.remaining(), self.root)
+        return question_data
+
+    def answer(self, option_idx):
+        """Record an answer for the current question and return whether it was correct"""
+        history_item = self.question_history[self.current_question_index]
+        correct = history_item["order"][option_idx] == history_item["data"].answer
+
+        if correct:
+            self.score += 2 if history_item["is_googly"] else 1
+        self.question_history.record_answer(self.current_question_index, option_idx, self.score)
+        self.answered += 1
+
+        if self.stats is not None:
+            self.stats.record_answer(
+                self.selected_difficulty, history_item["data"].category, history_item["data"].template,
+                history_item["is_googly"], correct, time.perf_counter() - self.shown_at
+            )
+        return correct
+
+    def next(self):
+        self.current_question_index += 1
+
+    def prev(self):
+
+        if self.current_question_index > 0:
+            self.current_question_index -= 1
+            return True
+        return False
+
+def simulate_sessions(count, session_length=20, seed=None, memory_budget_mb=None, memory_profile=False):
+    """Play automated sessions without a display and report throughput (and memory per subsystem)"""
+    rng = random.Random(seed)
+    pools = {
+        name: QuestionPool(generator, max_size=DEFAULT_BANK_SIZE)
+        for name, generator in QuizApp.question_generators().items()
+    }
+    for pool in pools.values():
+        pool.fill_in_background(None)
+    engine = QuizEngine(pools)
+    memory = MemoryAccountant(memory_budget_mb)
+    engine.register_memory(memory)
+
+    if memory_profile:
+        MemoryAccountant.start_tracing()
+    difficulties = ["Easy", "Medium", "Hard"]
+    total_score = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        engine.start(rng.choice(difficulties))
+        for _ in range(session_length):
+            engine.current()
+            engine.answer(rng.randrange(OPTION_COUNT))
+            engine.stage_next()
+
+            if rng.random() < 0.1 and engine.prev():
+                engine.current()
+                engine.next()
+            engine.next()
+        total_score += engine.score
+
+        if memory_budget_mb:
+            memory.enforce()
+    elapsed = time.perf_counter() - start
+    print(f"{count} sessions x {session_length} questions in {elapsed:.3f}s")
+    print(f"{count / elapsed:.1f} sessions/s, {count * session_length / elapsed:.0f} questions/s")
+    print(f"Average score: {total_score / count:.2f}")
+    print(f"Staged next question hit rate: {engine.staging_stats()['hit_rate']:.1%}")
+
+    if memory_profile or memory_budget_mb:
+        report = memory.report()
+        for name, size in report["subsystems"].items():
+            print(f"{name:<20}{size / 1024:>10.1f} KiB")
+        print(f"{'total':<20}{report['total'] / 1024:>10.1f} KiB, {len(report['trims'])} trim(s)")
+
+        if "tracemalloc" in report:
+            print(f"tracemalloc: {report['tracemalloc']['current'] / 1024:.1f} KiB traced, "
+                  f"{report['tracemalloc']['peak'] / 1024:.1f} KiB peak")
+
+class WidgetRenderer:
+    """Sends only changed widget options to Tcl and counts Tcl calls per UI transition"""
+
+    def __init__(self):
+        self.applied = {}
+        self.calls = 0
+        self.depth = 0
+        self.start_calls = 0
+        self.transitions = {}
+        self.last_transition = None
+
+    def config(self, widget, **options):
+        """Apply only the options that differ from what was last applied to this widget"""
+        applied = self.applied.setdefault(str(widget), {})
+        changed = {key: value for key, value in options.items() if applied.get(key) != value}
+
+        if changed:
+            widget.config(**changed)
+            applied.update(changed)
+            self.calls += 1
+
+    def pack(self, widget, **options):
+        widget.pack(**options)
+        self.calls += 1
+
+    def pack_forget(self, widget):
+        widget.pack_forget()
+        self.calls += 1
+
+    @contextlib.contextmanager
+    def transition(self, name):
+        """Count the Tcl calls made by one outermost UI transition"""
+
+        if self.depth == 0:
+            self.start_calls = self.calls
+        self.depth += 1
+
+        try:
+            yield
+
+        finally:
+            self.depth -= 1
+
+            if self.depth == 0:
+                calls = self.calls - self.start_calls
+                stats = self.transitions.setdefault(name, [0, 0])
+                stats[0] += 1
+                stats[1] += calls
+                self.last_transition = (name, calls)
+
+    def report(self):
+        for name, (count, calls) in sorted(self.transitions.items()):
+            print(f"{name:<16}{count:>7} transitions{calls / count:>8.1f} Tcl calls each")
+
+class TextFitter:
+    """Word-wrapped line counts for label text, cached per (font, width) pair
+
+    Character widths are measured once per font, so wrapping a new text costs no Tcl calls.
+    """
+
+    def __init__(self, measure=None, max_texts=256):
+        self.measure = measure or self.tk_measure
+        self.max_texts = max_texts
+        self.fonts = {}
+        self.char_widths = {}
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def tk_measure(self, font, text):
+
+        if font not in self.fonts:
+            from tkinter import font as tkfont
+            family, size, *style = font
+            self.fonts[font] = tkfont.Font(family=family, size=size, weight="bold" if "bold" in style else "normal")
+        return self.fonts[font].measure(text)
+
+    def text_width(self, font, text):
+        widths = self.char_widths.setdefault(font, {})
+        total = 0
+        for char in text:
+            width = widths.get(char)
+
+            if width is None:
+                width = widths[char] = self.measure(font, char)
+            total += width
+        return total
+
+    def line_count(self, font, width, text):
+        """Lines text takes when wrapped at width pixels in font"""
+        texts = self.cache.setdefault((font, width), OrderedDict())
+
+        if text in texts:
+            self.hits += 1
+            texts.move_to_end(text)
+            return texts[text]
+        self.misses += 1
+        space = self.text_width(font, " ")
+        lines = 1
+        used = 0
+        for word in text.split():
+            word_width = self.text_width(font, word)
+
+            if used and used + space + word_width <= width:
+                used += space + word_width
+                continue
+
+            if used:
+                lines += 1
+            overflow = max(0, word_width - 1) // width
+            lines += overflow
+            used = word_width - overflow * width
+        texts[text] = lines
+
+        if len(texts) > self.max_texts:
+            texts.popitem(last=False)
+        return lines
+
+    def fit(self, family, sizes, width, text, max_lines, *style):
+        """Largest font from sizes (descending) that wraps text into max_lines, else the smallest"""
+        for size in sizes:
+            font = (family, size, *style)
+
+            if self.line_count(font, width, text) <= max_lines:
+                return font
+        return (family, sizes[-1], *style)
+
+def write_json_atomic(path, data, **dump_options):
+    """Write data as JSON via a temp file, fsync and rename, so a crash never leaves a torn file"""
+    tmp_path = path + ".tmp"
+
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, **dump_options)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class SettingsStore:
+    """All persisted settings in one JSON file, cached in memory and written atomically after a short debounce"""
+
+    def __init__(self, storage_path, root=None, delay_ms=500):
+        self.storage_path = storage_path
+        self.path = os.path.join(storage_path, "settings.json")
+        self.root = root
+        self.delay_ms = delay_ms
+        self.flush_id = None
+        self.writes = 0
+        self.data = self.load()
+
+    def load(self):
+        """Read settings.json, migrating the old theme.json and config.ini on first run"""
+
+        if os.path.exists(self.path):
+
+            try:
+
+                with open(self.path, "r") as f:
+                    return json.load(f)
+
+            except Exception as e:
+                print(f"Error loading settings: {e}")
+        data = {}
+        theme_file = os.path.join(self.storage_path, "theme.json")
+
+        if os.path.exists(theme_file):
+
+            try:
+
+                with open(theme_file, "r") as f:
+                    data["theme"] = json.load(f).get("theme", "light")
+
+            except Exception as e:
+                print(f"Error loading theme: {e}")
+        config_file = os.path.join(self.storage_path, "config.ini")
+
+        if os.path.exists(config_file):
+            config = configparser.ConfigParser()
+            config.read(config_file)
+
+            if "Geometry" in config:
+                data["geometry"] = dict(config["Geometry"])
+        return data
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        """Update a setting in memory and schedule a coalesced write if it changed"""
+
+        if self.data.get(key) == value:
+            return
+        self.data[key] = value
+
+        if self.root is None:
+            self.flush()
+            return
+
+        if self.flush_id is not None:
+            self.root.after_cancel(self.flush_id)
+        self.flush_id = self.root.after(self.delay_ms, self.flush)
+
+    def flush(self):
+        """Write settings atomically"""
+        self.flush_id = None
+
+        try:
+            write_json_atomic(self.path, self.data, indent=2)
+            self.writes += 1
+
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+
+    def close(self):
+
+        if self.flush_id is not None:
+            self.root.after_cancel(self.flush_id)
+            self.flush()
+
+class PlayerStats:
+    """Rolling answer aggregates and a top-score leaderboard, kept in memory and saved compactly to player_stats.json
+
+    Each aggregate is [answered, correct, current streak, best streak, total response seconds], keyed as
+    "overall", "difficulty:<name>", "template:<name>" or "round:googly"/"round:normal". Questions without a
+    template (online or imported) are kept under "category:<name>" instead.
+    """
+    LEADERBOARD_SIZE = 10
+
+    def __init__(self, storage_path, root=None, delay_ms=2000):
+        self.path = os.path.join(storage_path, "player_stats.json")
+        self.root = root
+        self.delay_ms = delay_ms
+        self.flush_id = None
+        self.aggregates = {}
+        self.leaderboard = []
+        self.load()
+
+    def load(self):
+
+        if not os.path.exists(self.path):
+            return
+
+        try:
+
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.aggregates = data.get("aggregates", {})
+            self.leaderboard = data.get("leaderboard", [])
+
+        except Exception as e:
+            print(f"Error loading player stats: {e}")
+
+    def record_answer(self, difficulty, category, template, is_googly, correct, response_time):
+        """Fold one answer into every aggregate it belongs to"""
+        source = f"template:{template}" if template else f"category:{category or 'online'}"
+        for key in ("overall", f"difficulty:{difficulty}", source, "round:googly" if is_googly else "round:normal"):
+            aggregate = self.aggregates.setdefault(key, [0, 0, 0, 0, 0.0])
+            aggregate[0] += 1
+
+            if correct:
+                aggregate[1] += 1
+                aggregate[2] += 1
+                aggregate[3] = max(aggregate[3], aggregate[2])
+            else:
+                aggregate[2] = 0
+            aggregate[4] += response_time
+        self.schedule_flush()
+
+    def record_session(self, difficulty, score, answered):
+        """Insert a finished session into the leaderboard, which stays sorted by score and answers"""
+
+        if not answered:
+            return
+        entry = [score, answered, difficulty, time.strftime("%Y-%m-%d %H:%M")]
+        keys = [(-s, -a) for s, a, _, _ in self.leaderboard]
+        self.leaderboard.insert(bisect.bisect_right(keys, (-score, -answered)), entry)
+        del self.leaderboard[self.LEADERBOARD_SIZE:]
+        self.schedule_flush()
+
+    def rows(self, prefix=None):
+        """Yield (key, answered, accuracy %, current streak, best streak, mean response seconds)"""
+        for key in sorted(self.aggregates):
+
+            if prefix is not None and not key.startswith(prefix):
+                continue
+            answered, correct, streak, best, total_time = self.aggregates[key]
+            yield key, answered, 100 * correct / answered, streak, best, total_time / answered
+
+    def report(self):
+        width = max([22] + [len(key) + 1 for key in self.aggregates])
+        lines = [f"{'':{width}}{'answered':>9}{'accuracy':>10}{'streak':>8}{'best':>6}{'avg s':>7}"]
+        for key, answered, accuracy, streak, best, mean_time in self.rows():
+            lines.append(f"{key:{width}}{answered:>9}{accuracy:>9.1f}%{streak:>8}{best:>6}{mean_time:>7.1f}")
+        lines.append("")
+        lines.append("Leaderboard")
+        for rank, (score, answered, difficulty, when) in enumerate(self.leaderboard, 1):
+            lines.append(f"{rank:>2}. {score:>4} pts  {answered:>4} answered  {difficulty:<7} {when}")
+
+        if not self.leaderboard:
+            lines.append("    no finished quizzes yet")
+        return "\n".join(lines)
+
+    def schedule_flush(self):
+
+        if self.root is None:
+            self.flush()
+            return
+
+        if self.flush_id is None:
+            self.flush_id = self.root.after(self.delay_ms, self.flush)
+
+    def flush(self):
+        """Write aggregates and the leaderboard atomically"""
+        self.flush_id = None
+
+        try:
+            write_json_atomic(self.path, {"aggregates": self.aggregates, "leaderboard": self.leaderboard},
+                              separators=(",", ":"))
+
+        except Exception as e:
+            print(f"Error saving player stats: {e}")
+
+    def close(self):
+
+        if self.flush_id is not None:
+            self.root.after_cancel(self.flush_id)
+            self.flush()
 
 class QuizApp:
 
-    def __init__(self, root):
+    MEMORY_CHECK_MS = 10_000
+    RESIZE_SETTLE_MS = 150
+    LAYOUT_BASE_WIDTH = 600
+    QUESTION_MAX_LINES = 4
+
+    def __init__(self, root, profiler=None, memory_profile=False, offline=False):
         self.root = root
+        self.profiler = profiler or StartupProfiler()
+        self.renderer = WidgetRenderer()
+        self.text_fitter = TextFitter()
+        self.resize_id = None
+        self.layout_width = None
+        self.layout_scale = 1.0
+        self.question_wraplength = 550
         self.root.title("Quiz Game")
         self.root.geometry("600x700")
 
@@ -51,7 +2891,8 @@ class QuizApp:
 
             except:
                 pass
-        self.config_file = os.path.join(self.quiz_storage_path, "config.ini")
+        self.settings = SettingsStore(self.quiz_storage_path, root)
+        self.responsive_layout = self.settings.get("responsive_layout", True)
         self.current_theme = self.load_theme()
         self.themes = {
             "light": {"bg": "#f0f0f0", "fg": "black", "button": "#e0e0e0", "accent": "#717771"},
@@ -60,240 +2901,126 @@ class QuizApp:
             "green": {"bg": "#e6ffe6", "fg": "black", "button": "#ccffcc", "accent": "#28a745"},
             "purple": {"bg": "#f0e6ff", "fg": "black", "button": "#e0ccff", "accent": "#6f42c1"}
         }
-        self.questions = {
-            "Easy": self.generate_easy_questions(100),
-            "Medium": self.generate_medium_questions(100),
-            "Hard": self.generate_hard_questions(100),
-            "Googly": self.generate_googly_questions(100)
+        self.question_snapshot = QuestionBankSnapshot(self.quiz_storage_path)
+        self.imported_questions = ImportedQuestionStore(self.quiz_storage_path)
+        self.question_pools = {
+            name: QuestionPool(
+                generator, snapshot=self.question_snapshot, difficulty=name, imported=self.imported_questions
+            )
+            for name, generator in self.question_generators().items()
         }
-        self.score = 0
-        self.current_question_index = 0
-        self.selected_difficulty = None
-        self.questions_used = []
-        self.normal_count_since_googly = 0
-        self.question_history = []
+        self.questions = {name: pool.questions for name, pool in self.question_pools.items()}
+        self.connectivity = ConnectivityMonitor((lambda: False) if offline else self.is_internet_available)
+        self.connectivity.refresh()
+        self.online_cache = OnlineQuestionCache(self.quiz_storage_path)
+        self.prefetcher = OpenTDBPrefetcher(root, self.connectivity, self.online_cache)
+        self.journal = SessionJournal(self.quiz_storage_path)
+        self.question_store = (
+            SQLiteQuestionStore(self.quiz_storage_path) if self.settings.get("question_store") == "sqlite" else None
+        )
+        self.player_stats = PlayerStats(self.quiz_storage_path, root)
+        self.engine = QuizEngine(
+            self.question_pools, (self.prefetcher.pop, self.online_cache.take), root, self.journal,
+            self.question_store, self.player_stats
+        )
+        self.resume_state = self.journal.resume(QuizEngine.HISTORY_WINDOW)
+        self.memory_profile = memory_profile or self.settings.get("memory_profiling", False)
+        self.memory = MemoryAccountant(self.settings.get("memory_budget_mb"))
+        self.memory_sizes = None
+        self.memory_reports = queue.Queue()
+        self.memory_thread = None
+        self.engine.register_memory(self.memory)
+        self.memory.register(
+            "network", lambda: (self.prefetcher.buffers, self.online_cache.index, self.online_cache.by_difficulty),
+            self.prefetcher.trim
+        )
+
+        if self.memory_profile:
+            MemoryAccountant.start_tracing()
+
+        if self.memory_profile or self.memory.budget is not None:
+            self.root.after(self.MEMORY_CHECK_MS, self.check_memory)
         self.main_frame = tk.Frame(root)
         self.quiz_frame = tk.Frame(root)
-        self.load_window_geometry()
-        self.create_widgets()
-        self.apply_theme(self.current_theme)
-        self.show_main_screen()
+        with self.profiler.phase("load_window_geometry"):
+            self.load_window_geometry()
+        with self.profiler.phase("create_widgets"):
+            self.create_widgets()
+            self.layout_screens()
+        with self.profiler.phase("apply_theme"):
+            self.apply_theme(self.current_theme)
+        with self.profiler.phase("show_main_screen"):
+            self.show_main_screen()
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind("<Configure>", self.on_configure, add="+")
+        self.root.bind("<F12>", self.toggle_debug_overlay)
 
     def load_theme(self):
-        """Load theme from JSON storage"""
-        theme_file = os.path.join(self.quiz_storage_path, "theme.json")
-
-        if os.path.exists(theme_file):
-
-            try:
-
-                with open(theme_file, 'r') as f:
-                    data = json.load(f)
-                    return data.get("theme", "light")
-
-            except Exception as e:
-                print(f"Error loading theme: {e}")
-        return "light"
-
-    def save_theme(self):
-        """Save current theme to JSON storage"""
-        theme_file = os.path.join(self.quiz_storage_path, "theme.json")
+        """Load theme from the settings store"""
+        return self.settings.get("theme", "light")
 
-        try:
-
-            with open(theme_file, 'w') as f:
-                json.dump({"theme": self.current_theme}, f)
-
-        except Exception as e:
-            print(f"Error saving theme: {e}")
+    def save_theme(self):
+        """Save current theme to the settings store"""
+        self.settings.set("theme", self.current_theme)
 
+    @metrics.timed("is_internet_available")
     def is_internet_available(self):
         """Check if internet connection is available"""
 
+        import socket
+
         try:
-            socket.create_connection(("8.8.8.8", 53), timeout=3)
-            return True
+
+            with socket.create_connection(("8.8.8.8", 53), timeout=3):
+                return True
 
         except OSError:
             return False
 
+    @metrics.timed("get_internet_question")
     def get_internet_question(self, difficulty):
         """Fetch question from OpenTDB API"""
-        difficulty_map = {
-            "Easy": "Easy",
-            "Medium": "Medium",
-            "Hard": "Hard"
-        }
 
         try:
-            url = f"https://opentdb.com/api.php?amount=1&difficulty={difficulty_map.get(difficulty, 'Medium')}&type=multiple"
-            response = requests.get(url, timeout=5)
-            data = response.json()
-
-            if data["response_code"] == 0:
-                question = data["results"][0]
-                q_text = html.unescape(question["question"])
-                correct = html.unescape(question["correct_answer"])
-                options = [html.unescape(opt) for opt in question["incorrect_answers"]]
-                options.append(correct)
-                random.shuffle(options)
-                return {
-                    "question": q_text,
-                    "options": options,
-                    "answer": correct
-                }
+            questions = fetch_opentdb_questions(self.prefetcher.session, difficulty, 1, self.prefetcher.url)
+            self.connectivity.record_success()
+
+            if questions:
+                return questions[0]
 
         except Exception as e:
             print(f"Error fetching internet question: {e}")
+            self.connectivity.record_failure()
         return None
 
-    def generate_easy_questions(self, count):
-        fake = Faker()
-        questions = []
-        for i in range(count):
-            templates = [
-                (f"What is the largest city in {fake.country()}?",
-                [fake.city() for _ in range(4)],
-                random.randint(0, 3)),
-                (f"What is {random.randint(5, 20)} + {random.randint(5, 20)}?",
-                [str(random.randint(10, 30)) for _ in range(3)] +
-                [str(random.randint(5, 20) + random.randint(5, 20))],
-                -1),
-                (f"Which planet is known as the {fake.word()} planet?",
-                [fake.word().capitalize() for _ in range(4)],
-                random.randint(0, 3)),
-                (f"What color is a {fake.word()}?",
-                [fake.color_name() for _ in range(4)],
-                random.randint(0, 3)),
-                (f"How many sides does a {fake.word()} have?",
-                [str(random.randint(3, 10)) for _ in range(4)],
-                random.randint(0, 3))
-            ]
-            template = random.choice(templates)
-            question = template[0]
-            options = template[1]
-            answer_idx = template[2]
-
-            if answer_idx == -1:
-                answer = options[-1]
-            else:
-                answer = options[answer_idx]
-            questions.append({
-                "question": question,
-                "options": options,
-                "answer": answer
-            })
-        return questions
+    @staticmethod
+    def question_generators():
+        return {
+            "Easy": QuizApp.generate_easy_questions,
+            "Medium": QuizApp.generate_medium_questions,
+            "Hard": QuizApp.generate_hard_questions,
+            "Googly": QuizApp.generate_googly_questions
+        }
 
-    def generate_medium_questions(self, count):
-        fake = Faker()
-        questions = []
-        for i in range(count):
-            templates = [
-                (f"Who wrote '{fake.catch_phrase()}'?",
-                 [fake.name() for _ in range(4)],
-                 random.randint(0, 3)),
-                (f"What is the chemical symbol for {fake.word().capitalize()}?",
-                 [fake.word()[:2].upper() for _ in range(4)],
-                 random.randint(0, 3)),
-                (f"In what year was {fake.company()} founded?",
-                 [str(random.randint(1800, 2023)) for _ in range(4)],
-                 random.randint(0, 3)),
-                (f"What is the largest {fake.word()} in the world?",
-                 [fake.word().capitalize() for _ in range(4)],
-                 random.randint(0, 3)),
-                (f"How many elements are in the periodic table?",
-                 [str(random.randint(50, 200)) for _ in range(4)],
-                 random.randint(0, 3))
-            ]
-            template = random.choice(templates)
-            question = template[0]
-            options = template[1]
-            answer = options[template[2]]
-            questions.append({
-                "question": question,
-                "options": options,
-                "answer": answer
-            })
-        return questions
+    @staticmethod
+    @metrics.timed("generate_easy_questions")
+    def generate_easy_questions(count, fake=None, rng=random):
+        return question_templates.generate("Easy", count, fake, rng)
 
-    def generate_hard_questions(self, count):
-        fake = Faker()
-        questions = []
-        for i in range(count):
-            templates = [
-                (f"What is the derivative of x^{random.randint(2, 5)}?",
-                 [f"{random.randint(1, 5)}x^{random.randint(1, 4)}" for _ in range(3)] +
-                 [f"{random.randint(2, 5)}x^{random.randint(1, 4)}"],
-                 -1),
-                (f"Who developed the theory of {fake.word()}?",
-                 [fake.name() for _ in range(4)],
-                 random.randint(0, 3)),
-                (f"What is the atomic number of {fake.word().capitalize()}?",
-                 [str(random.randint(1, 100)) for _ in range(4)],
-                 random.randint(0, 3)),
-                (f"In quantum physics, what does {fake.word().upper()} stand for?",
-                 [fake.word() for _ in range(4)],
-                 random.randint(0, 3)),
-                (f"What is the {fake.word()} constant approximately equal to?",
-                 [str(round(random.uniform(1.0, 10.0), 4)) for _ in range(4)],
-                 random.randint(0, 3))
-            ]
-            template = random.choice(templates)
-            question = template[0]
-            options = template[1]
-            answer_idx = template[2]
-
-            if answer_idx == -1:
-                answer = options[-1]
-            else:
-                answer = options[answer_idx]
-            questions.append({
-                "question": question,
-                "options": options,
-                "answer": answer
-            })
-        return questions
+    @staticmethod
+    @metrics.timed("generate_medium_questions")
+    def generate_medium_questions(count, fake=None, rng=random):
+        return question_templates.generate("Medium", count, fake, rng)
 
-    def generate_googly_questions(self, count):
-        fake = Faker()
-        questions = []
-        for i in range(count):
-            templates = [
-                (f"If a {fake.word()} is traveling at {random.randint(10, 100)} mph, how long to travel {random.randint(100, 500)} miles?",
-                 [f"{random.uniform(1, 10):.2f} hours" for _ in range(3)] +
-                 [f"{random.randint(100, 500)/random.randint(10, 100):.2f} hours"],
-                 -1),
-                (f"What is the next number: {random.randint(1, 10)}, {random.randint(11, 20)}, {random.randint(21, 30)}, __?",
-                 [str(random.randint(31, 50)) for _ in range(4)],
-                 random.randint(0, 3)),
-                (f"Which word doesn't belong: {fake.word()}, {fake.word()}, {fake.word()}, {fake.word()}?",
-                 [fake.word() for _ in range(4)],
-                 random.randint(0, 3)),
-                (f"Solve: ({random.randint(1, 10)} + {random.randint(1, 10)}) × {random.randint(1, 10)}",
-                 [str(random.randint(10, 100)) for _ in range(3)] +
-                 [str((random.randint(1, 10) + random.randint(1, 10)) * random.randint(1, 10))],
-                 -1),
-                (f"What is the {fake.word()} of {fake.word()} in {fake.country()}?",
-                 [fake.word().capitalize() for _ in range(4)],
-                 random.randint(0, 3))
-            ]
-            template = random.choice(templates)
-            question = template[0]
-            options = template[1]
-            answer_idx = template[2]
-
-            if answer_idx == -1:
-                answer = options[-1]
-            else:
-                answer = options[answer_idx]
-            questions.append({
-                "question": question,
-                "options": options,
-                "answer": answer
-            })
-        return questions
+    @staticmethod
+    @metrics.timed("generate_hard_questions")
+    def generate_hard_questions(count, fake=None, rng=random):
+        return question_templates.generate("Hard", count, fake, rng)
+
+    @staticmethod
+    @metrics.timed("generate_googly_questions")
+    def generate_googly_questions(count, fake=None, rng=random):
+        return question_templates.generate("Googly", count, fake, rng)
 
     def create_widgets(self):
         self.title_label = tk.Label(
@@ -324,6 +3051,18 @@ class QuizApp:
             padx=20,
             pady=10
         )
+        self.resume_button = tk.Button(
+            self.main_frame,
+            text="Resume Last Quiz",
+            command=self.resume_quiz,
+            font=("Arial", 12)
+        )
+        self.stats_button = tk.Button(
+            self.main_frame,
+            text="Stats & Leaderboard",
+            command=self.show_stats,
+            font=("Arial", 12)
+        )
         self.theme_button = tk.Button(
             self.main_frame,
             text="Theme",
@@ -334,7 +3073,7 @@ class QuizApp:
         self.create_theme_menu()
         self.score_label = tk.Label(
             self.quiz_frame,
-            text=f"Score: {self.score}",
+            text=f"Score: {self.engine.score}",
             font=("Arial", 16, "bold"),
             anchor="e"
         )
@@ -378,10 +3117,20 @@ class QuizApp:
             font=("Arial", 12),
             state=tk.DISABLED
         )
+        self.debug_label = tk.Label(
+            self.quiz_frame,
+            text="",
+            font=("Courier", 9),
+            justify=tk.LEFT,
+            anchor="w",
+            bg="black",
+            fg="#00FF00"
+        )
+        self.debug_overlay_visible = False
         self.home_button = tk.Button(
             self.quiz_frame,
             text="Home",
-            command=self.show_main_screen,
+            command=self.go_home,
             font=("Arial", 12)
         )
 
@@ -393,6 +3142,22 @@ class QuizApp:
                 command=lambda t=theme_name: self.apply_theme(t)
             )
 
+    def show_stats(self):
+        """Open the stats and leaderboard window from the in-memory aggregates"""
+        theme = self.themes[self.current_theme]
+        window = tk.Toplevel(self.root, bg=theme["bg"])
+        window.title("Stats & Leaderboard")
+        tk.Label(
+            window,
+            text=self.player_stats.report(),
+            font=("Courier", 11),
+            justify=tk.LEFT,
+            bg=theme["bg"],
+            fg=theme["fg"],
+            padx=20,
+            pady=20
+        ).pack()
+
     def show_theme_menu(self):
         """Show the theme selection menu"""
         self.theme_menu.post(
@@ -400,238 +3165,932 @@ class QuizApp:
             self.theme_button.winfo_rooty() + self.theme_button.winfo_height()
         )
 
+    @metrics.timed("apply_theme")
     def apply_theme(self, theme_name):
         """Apply a color theme to the application"""
         self.current_theme = theme_name
         self.save_theme()
         theme = self.themes[theme_name]
-        self.root.config(bg=theme["bg"])
-        self.main_frame.config(bg=theme["bg"])
-        self.title_label.config(bg=theme["bg"], fg=theme["fg"])
-        self.difficulty_label.config(bg=theme["bg"], fg=theme["fg"])
-        self.start_button.config(
-            bg=theme["accent"],
-            fg="white",
-            activebackground=theme["accent"],
-            activeforeground="white"
-        )
-        self.quiz_frame.config(bg=theme["bg"])
-        self.score_label.config(bg=theme["bg"], fg=theme["fg"])
-        self.round_label.config(bg=theme["bg"], fg=theme["fg"])
-        self.question_label.config(bg=theme["button"], fg=theme["fg"])
-        for btn in self.option_buttons:
-            btn.config(
-                bg=theme["button"],
-                fg=theme["fg"],
-                activebackground=theme["button"],
-                activeforeground=theme["fg"]
-            )
-        self.prev_button.config(
-            bg=theme["accent"],
-            fg="white",
-            activebackground=theme["accent"],
-            activeforeground="white"
-        )
-        self.next_button.config(
-            bg=theme["accent"],
-            fg="white",
-            activebackground=theme["accent"],
-            activeforeground="white"
-        )
-        self.home_button.config(
-            bg=theme["accent"],
-            fg="white",
-            activebackground=theme["accent"],
-            activeforeground="white"
-        )
-        self.theme_button.config(
-            bg=theme["accent"],
-            fg="white",
-            activebackground=theme["accent"],
-            activeforeground="white"
-        )
-        self.nav_frame.config(bg=theme["bg"])
+        accent = {
+            "bg": theme["accent"],
+            "fg": "white",
+            "activebackground": theme["accent"],
+            "activeforeground": "white"
+        }
+        render = self.renderer.config
 
-    def show_main_screen(self):
-        self.quiz_frame.pack_forget()
-        self.main_frame.pack(fill=tk.BOTH, expand=True, padx=50, pady=50)
+        with self.renderer.transition("apply_theme"):
+            render(self.root, bg=theme["bg"])
+            render(self.main_frame, bg=theme["bg"])
+            render(self.title_label, bg=theme["bg"], fg=theme["fg"])
+            render(self.difficulty_label, bg=theme["bg"], fg=theme["fg"])
+            render(self.start_button, **accent)
+            render(self.resume_button, **accent)
+            render(self.stats_button, bg=theme["button"], fg=theme["fg"])
+            render(self.quiz_frame, bg=theme["bg"])
+            render(self.score_label, bg=theme["bg"], fg=theme["fg"])
+            render(self.round_label, bg=theme["bg"], fg=theme["fg"])
+            render(self.question_label, bg=theme["button"], fg=theme["fg"])
+            for btn in self.option_buttons:
+                render(
+                    btn,
+                    bg=theme["button"],
+                    fg=theme["fg"],
+                    activebackground=theme["button"],
+                    activeforeground=theme["fg"]
+                )
+            for btn in (self.prev_button, self.next_button, self.home_button, self.theme_button):
+                render(btn, **accent)
+            render(self.nav_frame, bg=theme["bg"])
+
+    def layout_screens(self):
+        """Pack the children of both screens once; switching screens only swaps the frames"""
         self.theme_button.place(relx=0.95, rely=0.05, anchor=tk.NE)
         self.title_label.pack(pady=20)
         self.difficulty_label.pack(pady=10)
         self.difficulty_combobox.pack(pady=5)
         self.start_button.pack(pady=30)
+        self.stats_button.pack(pady=5)
+        self.score_label.pack(fill=tk.X, pady=5)
+        self.round_label.pack(fill=tk.X, pady=5)
+        self.question_label.pack(fill=tk.X, pady=20)
+        for btn in self.option_buttons:
+            btn.pack(fill=tk.X, pady=5)
+        self.nav_frame.pack(fill=tk.X, pady=10)
+        self.prev_button.pack(side=tk.LEFT, padx=5)
+        self.next_button.pack(side=tk.RIGHT, padx=5)
+        self.home_button.pack(side=tk.BOTTOM, pady=10)
+
+    def show_main_screen(self):
+
+        with self.renderer.transition("show_main_screen"):
+            self.renderer.pack_forget(self.quiz_frame)
+            self.renderer.pack(self.main_frame, fill=tk.BOTH, expand=True, padx=50, pady=50)
+
+            if self.resume_state is not None:
+                self.renderer.pack(self.resume_button, pady=5)
+            else:
+                self.renderer.pack_forget(self.resume_button)
+
+    def go_home(self):
+        """Finish the current session and return to the home screen"""
+        self.engine.end()
+        self.resume_state = None
+        self.show_main_screen()
 
     def start_quiz(self):
-        self.selected_difficulty = self.difficulty_var.get()
-        self.score = 0
-        self.current_question_index = 0
-        self.questions_used = []
-        self.normal_count_since_googly = 0
-        self.question_history = []
-        self.main_frame.pack_forget()
-        self.quiz_frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=20)
-        self.update_score()
+
+        with self.renderer.transition("start_quiz"):
+            self.resume_state = None
+            self.engine.start(self.difficulty_var.get())
+            self.enter_quiz()
+
+    def resume_quiz(self):
+        """Continue the unfinished session found in the journal at startup"""
+
+        with self.renderer.transition("resume_quiz"):
+            self.engine.resume(self.resume_state)
+            self.resume_state = None
+            self.enter_quiz()
+
+    def enter_quiz(self):
+        self.prefetcher.request(self.engine.selected_difficulty)
+        self.renderer.pack_forget(self.main_frame)
+        self.renderer.pack(self.quiz_frame, fill=tk.BOTH, expand=True, padx=30, pady=20)
         self.show_question()
 
+    @metrics.timed("show_question")
     def show_question(self):
+        history_item, is_new = self.engine.current()
+        question_data = history_item["data"]
+        order = history_item["order"]
+        user_answer_index = history_item["user_answer"]
+        render = self.renderer.config
 
-        if self.current_question_index < len(self.question_history):
-            history_item = self.question_history[self.current_question_index]
-            question_data = history_item["data"]
-            is_googly_round = history_item["is_googly"]
-            user_answer_index = history_item.get("user_answer")
-            options = history_item["displayed_options"]
-            self.question_label.config(text=question_data["question"])
-            for i in range(4):
-                self.option_buttons[i].config(
-                    text=f"{chr(65+i)}. {options[i]}",
-                    bg="SystemButtonFace",
-                    fg="black",
-                    state=tk.DISABLED
-                )
+        with self.renderer.transition("show_question"):
+            render(self.question_label, text=question_data.text)
 
-                if options[i] == question_data["answer"]:
-                    self.option_buttons[i].config(bg="#4CAF50", fg="white")
+            if self.layout_width is not None:
+                self.fit_question(question_data.text)
+            for i in range(4):
+                colors = {"bg": "SystemButtonFace", "fg": "black"}
 
-                if user_answer_index == i and options[i] != question_data["answer"]:
-                    self.option_buttons[i].config(bg="#F44336", fg="white")
+                if not is_new and order[i] == question_data.answer:
+                    colors = {"bg": "#4CAF50", "fg": "white"}
+                elif not is_new and user_answer_index == i:
+                    colors = {"bg": "#F44336", "fg": "white"}
+                render(
+                    self.option_buttons[i],
+                    text=f"{chr(65+i)}. {question_data.options[order[i]]}",
+                    state=tk.NORMAL if is_new else tk.DISABLED,
+                    **colors
+                )
+            render(self.next_button, state=tk.DISABLED if is_new else tk.NORMAL)
 
-            if is_googly_round:
-                self.round_label.config(text="GOOGLY ROUND! (Double Points)", fg="red")
+            if history_item["is_googly"]:
+                render(self.round_label, text="GOOGLY ROUND! (Double Points)", fg="red")
             else:
-                self.round_label.config(text=f"Normal Round ({self.normal_count_since_googly}/5 to next Googly)", fg="black")
-            self.next_button.config(state=tk.NORMAL)
-        else:
-            is_googly_round = self.normal_count_since_googly == 5
-
-            if is_googly_round and not self.questions["Googly"]:
-                is_googly_round = False
-                self.normal_count_since_googly = 0
-            question_data = None
-
-            if not is_googly_round and self.is_internet_available():
-                question_data = self.get_internet_question(self.selected_difficulty)
-
-            if question_data is None:
-                source = "Googly" if is_googly_round else self.selected_difficulty
-                available_questions = [
-                    q for q in self.questions[source]
-
-                    if q not in self.questions_used
-                ]
-
-                if not available_questions:
-                    self.questions_used = []
-                    available_questions = self.questions[source].copy()
-                question_data = random.choice(available_questions)
-                self.questions_used.append(question_data)
-            displayed_options = question_data["options"].copy()
-            random.shuffle(displayed_options)
-            self.question_history.append({
-                "data": question_data,
-                "is_googly": is_googly_round,
-                "displayed_options": displayed_options,
-                "user_answer": None
-            })
-
-            if is_googly_round:
-                self.normal_count_since_googly = 0
-                self.round_label.config(text="GOOGLY ROUND! (Double Points)", fg="red")
-            else:
-                self.normal_count_since_googly += 1
-                self.round_label.config(text=f"Normal Round ({self.normal_count_since_googly}/5 to next Googly)", fg="black")
-            self.question_label.config(text=question_data["question"])
-            for i in range(4):
-                self.option_buttons[i].config(
-                    text=f"{chr(65+i)}. {displayed_options[i]}",
-                    bg="SystemButtonFace",
-                    fg="black",
-                    state=tk.NORMAL
-                )
-            self.next_button.config(state=tk.DISABLED)
-        self.update_score()
-        self.prev_button.config(state=tk.NORMAL if self.current_question_index > 0 else tk.DISABLED)
-        self.score_label.pack(fill=tk.X, pady=5)
-        self.round_label.pack(fill=tk.X, pady=5)
-        self.question_label.pack(fill=tk.X, pady=20)
-        for btn in self.option_buttons:
-            btn.pack(fill=tk.X, pady=5)
-        self.nav_frame.pack(fill=tk.X, pady=10)
-        self.prev_button.pack(side=tk.LEFT, padx=5)
-        self.next_button.pack(side=tk.RIGHT, padx=5)
-        self.home_button.pack(side=tk.BOTTOM, pady=10)
+                render(self.round_label, text=f"Normal Round ({self.engine.normal_count_since_googly}/5 to next Googly)", fg="black")
+            self.update_score()
+            render(self.prev_button, state=tk.NORMAL if self.engine.current_question_index > 0 else tk.DISABLED)
 
+    @metrics.timed("check_answer")
     def check_answer(self, option_idx):
-        selected_text = self.option_buttons[option_idx].cget("text")[3:]
-        question_data = self.question_history[self.current_question_index]["data"]
-        correct_answer = question_data["answer"]
-        self.question_history[self.current_question_index]["user_answer"] = option_idx
-        for btn in self.option_buttons:
-            btn.config(state=tk.DISABLED)
-        for i in range(4):
-            option_text = self.option_buttons[i].cget("text")[3:]
+        history_item = self.engine.question_history[self.engine.current_question_index]
+        order = history_item["order"]
+        answer = history_item["data"].answer
+        correct = self.engine.answer(option_idx)
+        render = self.renderer.config
 
-            if option_text == correct_answer:
-                self.option_buttons[i].config(bg="#4CAF50", fg="white")
+        with self.renderer.transition("check_answer"):
+            for i in range(4):
 
-        if selected_text == correct_answer:
-            points = 2 if self.question_history[self.current_question_index]["is_googly"] else 1
-            self.score += points
-            self.update_score()
-        else:
-            self.option_buttons[option_idx].config(bg="#F44336", fg="white")
-        self.next_button.config(state=tk.NORMAL)
+                if order[i] == answer:
+                    render(self.option_buttons[i], state=tk.DISABLED, bg="#4CAF50", fg="white")
+                elif i == option_idx:
+                    render(self.option_buttons[i], state=tk.DISABLED, bg="#F44336", fg="white")
+                else:
+                    render(self.option_buttons[i], state=tk.DISABLED)
+
+            if correct:
+                self.update_score()
+            render(self.next_button, state=tk.NORMAL)
+        self.root.after_idle(self.engine.stage_next)
 
     def update_score(self):
-        self.score_label.config(text=f"Score: {self.score} | Question: {self.current_question_index+1}")
+        self.renderer.config(self.score_label, text=f"Score: {self.engine.score} | Question: {self.engine.current_question_index+1}")
 
     def next_question(self):
-        self.current_question_index += 1
-        self.show_question()
+        start = time.perf_counter()
+
+        with self.renderer.transition("next_question"):
+            self.engine.next()
+            self.show_question()
+        self.root.after_idle(lambda: metrics.observe("next_to_painted", time.perf_counter() - start))
 
     def prev_question(self):
 
-        if self.current_question_index > 0:
-            self.current_question_index -= 1
-            self.show_question()
+        with self.renderer.transition("prev_question"):
+
+            if self.engine.prev():
+                self.show_question()
 
     def save_window_geometry(self):
-        """Save window geometry and last transaction type"""
-        config = configparser.ConfigParser()
-        config["Geometry"] = {
+        """Record window geometry and state in the settings store"""
+        self.settings.set("geometry", {
             "size": self.root.geometry(),
             "state": self.root.state()
-        }
+        })
+
+    def on_configure(self, event):
+        """Track resizes in memory; the settings store coalesces the disk write and reflow waits for the resize to settle"""
+
+        if event.widget is self.root:
+            self.save_window_geometry()
+
+            if self.responsive_layout:
 
-        with open(self.config_file, "w") as f:
-            config.write(f)
+                if self.resize_id is not None:
+                    self.root.after_cancel(self.resize_id)
+                self.resize_id = self.root.after(self.RESIZE_SETTLE_MS, self.reflow)
+
+    @metrics.timed("reflow")
+    def reflow(self):
+        """Recompute wrap lengths and font sizes for the settled window width"""
+        self.resize_id = None
+        width = self.root.winfo_width()
+
+        if width == self.layout_width:
+            return
+        self.layout_width = width
+        self.layout_scale = scale = min(max(width / self.LAYOUT_BASE_WIDTH, 0.8), 1.6)
+        self.question_wraplength = max(200, width - 80)
+        render = self.renderer.config
+
+        with self.renderer.transition("reflow"):
+            render(self.title_label, font=("Arial", round(24 * scale), "bold"))
+            render(self.score_label, font=("Arial", round(16 * scale), "bold"))
+            render(self.round_label, font=("Arial", round(12 * scale)))
+            for btn in self.option_buttons:
+                render(btn, font=("Arial", round(12 * scale)), width=0, wraplength=self.question_wraplength - 20)
+
+            if self.engine.selected_difficulty is not None and len(self.engine.question_history):
+                self.fit_question(self.engine.question_history[self.engine.current_question_index]["data"].text)
+
+    def fit_question(self, text):
+        """Use the largest question font that wraps text into QUESTION_MAX_LINES at the current width"""
+        sizes = [round(size * self.layout_scale) for size in (18, 16, 14, 12)]
+        font = self.text_fitter.fit("Arial", sizes, self.question_wraplength, text, self.QUESTION_MAX_LINES)
+        self.renderer.config(self.question_label, font=font, wraplength=self.question_wraplength)
 
     def load_window_geometry(self):
+        geometry_settings = self.settings.get("geometry")
 
-        if os.path.exists(self.config_file):
-            config = configparser.ConfigParser()
-            config.read(self.config_file)
+        if geometry_settings:
+            geometry = geometry_settings.get("size", "")
+            state = geometry_settings.get("state", "normal")
 
-            if "Geometry" in config:
-                geometry = config["Geometry"].get("size", "")
-                state = config["Geometry"].get("state", "normal")
+            if geometry:
+                self.root.geometry(geometry)
+                self.root.update_idletasks()
+                self.root.update()
+
+            if state == "zoomed":
+                self.root.state("zoomed")
+            elif state == "iconic":
+                self.root.iconify()
+
+    def toggle_debug_overlay(self, event=None):
+        """Show or hide live hot-path latencies over the quiz screen (F12)"""
+        self.debug_overlay_visible = not self.debug_overlay_visible
+
+        if self.debug_overlay_visible:
+            self.debug_label.place(relx=0.0, rely=1.0, anchor=tk.SW)
+            self.debug_label.lift()
+            self.refresh_debug_overlay()
+        else:
+            self.debug_label.place_forget()
+
+    def refresh_debug_overlay(self):
+
+        if not self.debug_overlay_visible:
+            return
+        lines = [f"{'path':<24}{'n':>6}{'p50':>10}{'p99':>10}"]
+        for name, stats in metrics.summary().items():
+            lines.append(f"{name:<24}{stats['count']:>6}{stats['p50'] * 1000:>8.2f}ms{stats['p99'] * 1000:>8.2f}ms")
+        connectivity = self.connectivity.stats()
+        lines.append(f"online={connectivity['online']} circuit_open={connectivity['circuit_open']} "
+                     f"hits={connectivity['hits']} misses={connectivity['misses']}")
+
+        if self.memory_sizes is not None:
+            budget = f"{self.memory.budget / 2 ** 20:.0f}" if self.memory.budget else "none"
+            lines.append(f"memory: {sum(self.memory_sizes.values()) / 2 ** 20:.1f} MiB, budget {budget}, "
+                         f"{len(self.memory.trims)} trim(s)")
+        staging = self.engine.staging_stats()
+        lines.append(f"staged next: hits={staging['hits']} misses={staging['misses']} "
+                     f"hit rate={staging['hit_rate']:.0%}")
+
+        if self.renderer.last_transition is not None:
+            lines.append("last transition: %s, %d Tcl calls" % self.renderer.last_transition)
+        self.debug_label.config(text="\n".join(lines))
+        self.root.after(500, self.refresh_debug_overlay)
+
+    def check_memory(self):
+        """Measure memory every MEMORY_CHECK_MS on a worker thread; walking large pools would stall the mainloop"""
+        self.measure_memory()
+        self.root.after(self.MEMORY_CHECK_MS, self.check_memory)
+
+    def measure_memory(self):
+
+        if self.memory_thread is not None and self.memory_thread.is_alive():
+            return
+
+        def run():
+
+            try:
+                report = self.memory.report()
+
+            except RuntimeError as e:
+                print(f"Error measuring memory: {e}")
+                return
+
+            if self.memory_profile:
+                self.memory.dump(self.quiz_storage_path, report)
+            self.memory_reports.put(report)
+        self.memory_thread = threading.Thread(target=run, daemon=True)
+        self.memory_thread.start()
+        self.root.after(100, self.poll_memory)
+
+    def poll_memory(self):
+        """Apply a finished measurement on the Tk thread: one trim step, then measure again soon"""
 
-                if geometry:
-                    self.root.geometry(geometry)
-                    self.root.update_idletasks()
-                    self.root.update()
+        try:
+            report = self.memory_reports.get_nowait()
+
+        except queue.Empty:
 
-                if state == "zoomed":
-                    self.root.state("zoomed")
-                elif state == "iconic":
-                    self.root.iconify()
+            if self.memory_thread.is_alive():
+                self.root.after(100, self.poll_memory)
+            return
+        self.memory_sizes = report["subsystems"]
+
+        if self.memory.over_budget(self.memory_sizes) and self.memory.trim_step(self.memory_sizes):
+            self.root.after(1000, self.measure_memory)
 
     def on_close(self):
         """Handler for window close event"""
+        metrics.dump(self.quiz_storage_path)
+
+        if self.memory_profile:
+            self.memory.dump(self.quiz_storage_path)
         self.save_window_geometry()
+        self.settings.close()
+        self.player_stats.close()
+        self.journal.close()
+
+        if self.question_store is not None:
+            self.question_store.close()
+        self.prefetcher.stop()
+        self.online_cache.close()
         self.root.destroy()
 
+class FakeOpenTDBServer:
+    """Local stand-in for OpenTDB's api.php, returning well-formed multiple-choice results"""
+
+    def __init__(self):
+        self.server = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/api.php"
+
+    def start(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs, urlparse
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                params = parse_qs(urlparse(self.path).query)
+                amount = int(params.get("amount", ["1"])[0])
+                difficulty = params.get("difficulty", ["medium"])[0].lower()
+                body = json.dumps({
+                    "response_code": 0,
+                    "results": [{
+                        "type": "multiple",
+                        "difficulty": difficulty,
+                        "category": "Science &amp; Nature",
+                        "question": f"Which of these is answer number {random.randint(1, 10**9)}?",
+                        "correct_answer": "Right",
+                        "incorrect_answers": ["Wrong", "Also wrong", "&quot;Wrong&quot;"]
+                    } for _ in range(amount)]
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def measure(func, repeat, warmup=1):
+    """Return wall-clock seconds for each of repeat calls after warmup calls"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def summarize(samples, unit_count=1):
+    """min, median and p99 in seconds per unit"""
+    import statistics
+    ordered = sorted(sample / unit_count for sample in samples)
+    return {
+        "runs": len(ordered),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p99": ordered[max(0, math.ceil(len(ordered) * 0.99) - 1)]
+    }
+
+def start_xvfb():
+    """Start Xvfb on a free display and wait until it accepts clients; returns (process, display) or (None, None)"""
+    import shutil
+    import subprocess
+
+    if not sys.platform.startswith("linux") or not shutil.which("Xvfb"):
+        return None, None
+    read_fd, write_fd = os.pipe()
+
+    try:
+        xvfb = subprocess.Popen(["Xvfb", "-displayfd", str(write_fd), "-nolisten", "tcp"],
+                                pass_fds=(write_fd,), stderr=subprocess.DEVNULL)
+
+    except OSError as e:
+        print(f"Error starting Xvfb: {e}")
+        os.close(read_fd)
+        return None, None
+
+    finally:
+        os.close(write_fd)
+
+    with os.fdopen(read_fd) as f:
+        display = f.readline().strip()
+
+    if not display:
+        xvfb.wait()
+        return None, None
+    return xvfb, f":{display}"
+
+def benchmark_startup(repeat):
+    """Time from QuizApp.__init__ to the first drawn frame in a throwaway HOME; needs a (virtual) display"""
+    import tempfile
+    xvfb = None
+    saved = {name: os.environ.get(name) for name in ("DISPLAY", "HOME")}
+
+    if not saved["DISPLAY"]:
+        xvfb, display = start_xvfb()
+
+        if display is not None:
+            os.environ["DISPLAY"] = display
+
+    def first_frame():
+        root = tk.Tk()
+        app = QuizApp(root, offline=True)
+        root.update()
+        app.on_close()
+
+    try:
+
+        with tempfile.TemporaryDirectory(prefix="quiz_bench_") as home:
+            os.environ["HOME"] = home
+            return summarize(measure(first_frame, repeat))
+
+    except tk.TclError as e:
+        return {"skipped": f"no display available ({e})"}
+
+    finally:
+        for name, value in saved.items():
+
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+def benchmark_generation(repeat, count=500):
+    results = {}
+    fake = new_faker()
+    for name, generator in QuizApp.question_generators().items():
+        samples = measure(lambda: generator(count, fake), repeat)
+        results[name] = summarize(samples, count)
+        results[name]["questions_per_second"] = 1 / results[name]["median"]
+
+    try:
+        load_vocabulary()
+
+    except ImportError:
+        return results
+    for name in QuizApp.question_generators():
+        samples = measure(lambda: question_templates.generate_batch(name, count * 10), repeat)
+        results[f"{name} (batch)"] = summarize(samples, count * 10)
+        results[f"{name} (batch)"]["questions_per_second"] = 1 / results[f"{name} (batch)"]["median"]
+    return results
+
+def benchmark_selection(repeat, draws=1000):
+    """Per-question latency of the QuizEngine path behind show_question"""
+    pools = {
+        name: QuestionPool(generator, max_size=DEFAULT_BANK_SIZE)
+        for name, generator in QuizApp.question_generators().items()
+    }
+    engine = QuizEngine(pools)
+    engine.start("Easy")
+
+    def select():
+        for _ in range(draws):
+            engine.current()
+            engine.next()
+    return summarize(measure(select, repeat), draws)
+
+def benchmark_fetch(repeat):
+    """get_internet_question against a local fake OpenTDB server"""
+    import types
+    server = FakeOpenTDBServer().start()
+    app = types.SimpleNamespace(
+        prefetcher=types.SimpleNamespace(session=new_http_session(), url=server.url),
+        connectivity=ConnectivityMonitor(lambda: True)
+    )
+
+    try:
+        return summarize(measure(lambda: QuizApp.get_internet_question(app, "Easy"), repeat))
+
+    finally:
+        server.stop()
+
+def run_benchmarks(repeat=20, output=None, compare=None):
+    """Run the benchmark suite, print a report and save JSON results"""
+    results = {
+        "startup": benchmark_startup(max(3, repeat // 4)),
+        "generation": benchmark_generation(max(3, repeat // 4)),
+        "selection": benchmark_selection(repeat),
+        "fetch": benchmark_fetch(repeat)
+    }
+    flat = {}
+    for name, result in results.items():
+
+        if "runs" in result or "skipped" in result:
+            flat[name] = result
+        else:
+            for sub_name, sub_result in result.items():
+                flat[f"{name}.{sub_name}"] = sub_result
+    baseline = {}
+
+    if compare:
+
+        with open(compare, "r") as f:
+            baseline = json.load(f)["results"]
+    print(f"{'benchmark':<20}{'min':>12}{'median':>12}{'p99':>12}")
+    for name, result in flat.items():
+
+        if "skipped" in result:
+            print(f"{name:<20}  skipped: {result['skipped']}")
+            continue
+        line = f"{name:<20}" + "".join(f"{result[key] * 1e6:>10.1f}us" for key in ("min", "median", "p99"))
+
+        if name in baseline and "median" in baseline[name]:
+            line += f"  {result['median'] / baseline[name]['median']:.2f}x vs baseline"
+        print(line)
+
+    import subprocess
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+
+    except OSError:
+        commit = ""
+    output = output or f"benchmark-{commit or 'results'}.json"
+
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "python": sys.version.split()[0],
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": flat
+        }, f, indent=2)
+    print(f"Saved results to {output}")
+
+class QuizServer:
+    """Local asyncio HTTP/JSON quiz service; sessions share read-only question pools but each has its own decks
+
+    POST   /sessions               {"difficulty": "Easy"} -> new session and its first question
+    GET    /sessions/<id>/question current question
+    POST   /sessions/<id>/answer   {"option": 0-3}
+    POST   /sessions/<id>/next     and /prev
+    DELETE /sessions/<id>
+    """
+    REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 409: "Conflict"}
+
+    def __init__(self, pools, max_sessions=100_000):
+        self.pools = pools
+        self.max_sessions = max_sessions
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+
+    def question_payload(self, session_id, engine):
+        history_item, is_new = engine.current()
+        question_data = history_item["data"]
+        return {
+            "session": session_id,
+            "index": engine.current_question_index,
+            "question": question_data.text,
+            "options": [question_data.options[i] for i in history_item["order"]],
+            "is_googly": history_item["is_googly"],
+            "answered": history_item["user_answer"],
+            "score": engine.score
+        }
+
+    def handle(self, method, path, body):
+        """Route one request; returns (status, payload)"""
+        parts = [part for part in path.split("/") if part]
+
+        if method == "POST" and parts == ["sessions"]:
+            difficulty = body.get("difficulty", "Easy")
+
+            if difficulty not in ("Easy", "Medium", "Hard"):
+                return 400, {"error": "difficulty must be Easy, Medium or Hard"}
+
+            if len(self.sessions) >= self.max_sessions:
+                del self.sessions[next(iter(self.sessions))]
+            session_id = str(next(self.session_ids))
+            engine = QuizEngine(self.pools, private_decks=True)
+            engine.start(difficulty)
+            self.sessions[session_id] = engine
+            return 201, self.question_payload(session_id, engine)
+
+        if len(parts) < 2 or parts[0] != "sessions" or parts[1] not in self.sessions:
+            return 404, {"error": "unknown session"}
+        session_id = parts[1]
+        engine = self.sessions[session_id]
+        action = parts[2] if len(parts) > 2 else None
+
+        if method == "DELETE" and action is None:
+            del self.sessions[session_id]
+            return 200, {"session": session_id, "score": engine.score}
+
+        if method == "GET" and action == "question":
+            return 200, self.question_payload(session_id, engine)
+
+        if method == "POST" and action == "answer":
+            history_item, is_new = engine.current()
+            option = body.get("option")
+
+            if not is_new:
+                return 409, {"error": "question already answered"}
+
+            if type(option) is not int or option not in range(OPTION_COUNT):
+                return 400, {"error": "option must be 0-3"}
+            correct = engine.answer(option)
+            return 200, {
+                "correct": correct,
+                "answer": history_item["order"].index(history_item["data"].answer),
+                "score": engine.score
+            }
+
+        if method == "POST" and action in ("next", "prev"):
+            history_item, is_new = engine.current()
+
+            if action == "next" and is_new:
+                return 409, {"error": "answer the current question first"}
+
+            if action == "next":
+                engine.next()
+            else:
+                engine.prev()
+            return 200, self.question_payload(session_id, engine)
+        return 404, {"error": "not found"}
+
+    async def serve_client(self, reader, writer):
+        import asyncio
+
+        try:
+            while True:
+                request_line = await reader.readline()
+
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                raw_body = await reader.readexactly(length) if length else b""
+
+                try:
+                    body = json.loads(raw_body) if raw_body else {}
+                    status, payload = self.handle(method, path, body if isinstance(body, dict) else {})
+
+                except ValueError:
+                    status, payload = 400, {"error": "invalid JSON"}
+                data = json.dumps(payload).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {self.REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        """Accept clients until cancelled; asyncio is only imported by the server paths"""
+        import asyncio
+        server = await asyncio.start_server(self.serve_client, host, port)
+        print(f"Serving quiz on http://{host}:{port} ({sum(len(p.questions) for p in self.pools.values())} questions)")
+
+        async with server:
+            await server.serve_forever()
+
+def load_shared_pools(size=DEFAULT_BANK_SIZE, imported_limit=10_000):
+    """Fill one fixed pool per difficulty from the stored snapshot, when there is one, plus imported questions"""
+    storage_path = os.path.join(os.path.expanduser("~"), ".quiz_app_config")
+    os.makedirs(storage_path, exist_ok=True)
+    snapshot = QuestionBankSnapshot(storage_path)
+    imported = ImportedQuestionStore(storage_path)
+    pools = {}
+    for name, generator in QuizApp.question_generators().items():
+        pool = QuestionPool(generator, target=size, max_size=size + imported_limit, snapshot=snapshot,
+                            difficulty=name, imported=imported)
+        pool.fill_in_background(None)
+        pool.target = pool.max_size = len(pool.questions)
+        pools[name] = pool
+    return pools
+
+async def http_json(reader, writer, method, path, body=None):
+    """Send one keep-alive request and return (status, payload)"""
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: quiz\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+async def run_load_test(host, port, concurrency, total_requests):
+    """Play quiz sessions from many concurrent clients and report throughput and tail latency"""
+    import asyncio
+    latencies = []
+    remaining = [total_requests]
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+
+        async def call(method, path, body=None):
+            remaining[0] -= 1
+            start = time.perf_counter()
+            result = await http_json(reader, writer, method, path, body)
+            latencies.append(time.perf_counter() - start)
+            return result
+
+        try:
+            while remaining[0] > 0:
+                _, question = await call("POST", "/sessions", {"difficulty": random.choice(["Easy", "Medium", "Hard"])})
+                session = question["session"]
+                for _ in range(20):
+
+                    if remaining[0] <= 0:
+                        break
+                    await call("POST", f"/sessions/{session}/answer", {"option": random.randrange(OPTION_COUNT)})
+                    await call("POST", f"/sessions/{session}/next")
+                await call("DELETE", f"/sessions/{session}")
+
+        finally:
+            writer.close()
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stats = summarize(latencies)
+    print(f"{len(latencies)} requests from {concurrency} clients in {elapsed:.2f}s: {len(latencies) / elapsed:.0f} requests/s")
+    print(f"latency min {stats['min'] * 1000:.2f} ms, median {stats['median'] * 1000:.2f} ms, "
+          f"p99 {stats['p99'] * 1000:.2f} ms, max {max(latencies) * 1000:.2f} ms")
+
+def build_snapshot(size, seed, workers=1, store=None, vectorized=False):
+    """Rebuild the stored question banks offline, optionally across worker processes and into a SQLite store"""
+    storage_path = os.path.join(os.path.expanduser("~"), ".quiz_app_config")
+    os.makedirs(storage_path, exist_ok=True)
+    snapshot = QuestionBankSnapshot(storage_path, seed=seed)
+    executor = None
+
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers)
+    worker_stats = {}
+    start = time.perf_counter()
+
+    try:
+        for name in QuizApp.question_generators():
+            bank = build_question_bank(name, size, seed, executor, worker_stats, vectorized)
+            snapshot.save(name, bank.to_state())
+
+            if store is not None:
+                store.replace_source(name, "generated", bank)
+            print(f"{name}: {len(bank)} questions ({size - len(bank)} duplicates removed)")
+
+    finally:
+
+        if executor is not None:
+            executor.shutdown()
+    snapshot.activate()
+    elapsed = time.perf_counter() - start
+    for pid, (count, busy) in sorted(worker_stats.items()):
+        print(f"worker {pid}: {count} questions, {count / busy:.0f} questions/s")
+    print(f"Built {size * len(QuizApp.question_generators())} questions in {elapsed:.2f}s with {workers} worker(s)")
+    print(f"Saved question bank v{snapshot.version} (seed {seed}) to {snapshot.path}")
+
+    if store is not None:
+        print(f"Wrote generated questions to {store.path}")
+
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = QuizApp(root)
+    parser = argparse.ArgumentParser(description="Quiz Game")
+    parser.add_argument("--build-bank", action="store_true", help="rebuild the stored question banks and exit")
+    parser.add_argument("--bank-size", type=int, default=DEFAULT_BANK_SIZE, help="questions per difficulty for --build-bank")
+    parser.add_argument("--bank-seed", type=int, default=DEFAULT_BANK_SEED, help="seed for --build-bank")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes for --build-bank")
+    parser.add_argument("--vectorized", action="store_true", help="generate --build-bank questions in NumPy batches")
+    parser.add_argument("--bench-sampler", action="store_true", help="benchmark no-repeat question draws and exit")
+    parser.add_argument("--headless", action="store_true", help="run without a display (use with --simulate)")
+    parser.add_argument("--simulate", type=int, metavar="N", help="play N automated sessions with --headless")
+    parser.add_argument("--session-length", type=int, default=20, help="questions per simulated session")
+    parser.add_argument("--benchmark", action="store_true", help="run the benchmark suite and exit")
+    parser.add_argument("--benchmark-repeat", type=int, default=20, help="runs per benchmark")
+    parser.add_argument("--benchmark-output", help="JSON file for benchmark results")
+    parser.add_argument("--benchmark-compare", metavar="JSON", help="earlier results to compare medians against")
+    parser.add_argument("--tcl-stats", action="store_true", help="print Tcl calls per UI transition on exit")
+    parser.add_argument("--profile-startup", action="store_true", help="print a startup phase breakdown and exit")
+    parser.add_argument("--startup-budget", type=float, metavar="MS", help="exit non-zero if --profile-startup exceeds this")
+    parser.add_argument("--serve", action="store_true", help="run the multi-session HTTP/JSON quiz service")
+    parser.add_argument("--host", default="127.0.0.1", help="address for --serve and --load-test")
+    parser.add_argument("--port", type=int, default=8765, help="port for --serve and --load-test")
+    parser.add_argument("--load-test", action="store_true", help="drive a running --serve instance and report requests/s")
+    parser.add_argument("--concurrency", type=int, default=100, help="concurrent clients for --load-test")
+    parser.add_argument("--requests", type=int, default=20_000, help="total requests for --load-test")
+    parser.add_argument("--import", dest="import_path", metavar="FILE", help="stream questions from a CSV, JSON Lines or OpenTDB dump")
+    parser.add_argument("--import-format", choices=["csv", "jsonl", "opentdb"], help="format for --import (default: by extension)")
+    parser.add_argument("--import-difficulty", choices=["Easy", "Medium", "Hard"], help="difficulty for records without one")
+    parser.add_argument("--stats", action="store_true", help="print answer statistics and the leaderboard and exit")
+    parser.add_argument("--memory-profile", action="store_true", help="trace memory per subsystem into memory.json")
+    parser.add_argument("--memory-budget", type=float, metavar="MB", help="memory budget for --headless (the GUI uses memory_budget_mb in settings)")
+    parser.add_argument("--question-store", choices=["memory", "sqlite"], help="where questions live (saved for later runs)")
+    args = parser.parse_args()
+
+    storage_path = os.path.join(os.path.expanduser("~"), ".quiz_app_config")
+    os.makedirs(storage_path, exist_ok=True)
+    question_store = open_question_store(storage_path, args.question_store)
+
+    if args.stats:
+        print(PlayerStats(storage_path).report())
+        sys.exit(0)
+
+    if args.import_path:
+        importer = QuestionImporter(
+            question_store or ImportedQuestionStore(storage_path), default_difficulty=args.import_difficulty
+        )
+        importer.run(args.import_path, args.import_format)
+        sys.exit(0)
+
+    if args.serve:
+        import asyncio
+
+        try:
+            asyncio.run(QuizServer(load_shared_pools(args.bank_size)).serve(args.host, args.port))
+
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    if args.load_test:
+        import asyncio
+        asyncio.run(run_load_test(args.host, args.port, args.concurrency, args.requests))
+        sys.exit(0)
+
+    if args.benchmark:
+        run_benchmarks(args.benchmark_repeat, args.benchmark_output, args.benchmark_compare)
+        sys.exit(0)
+
+    if args.headless:
+
+        if not args.simulate:
+            parser.error("--headless needs --simulate N")
+        simulate_sessions(args.simulate, args.session_length, memory_budget_mb=args.memory_budget,
+                          memory_profile=args.memory_profile)
+        sys.exit(0)
+
+    if args.bench_sampler:
+        benchmark_sampler()
+        sys.exit(0)
+
+    if args.build_bank:
+        build_snapshot(args.bank_size, args.bank_seed, args.workers, question_store, args.vectorized)
+        sys.exit(0)
+
+    if question_store is not None:
+        question_store.close()
+    profiler = StartupProfiler()
+
+    with profiler.phase("tk.Tk()"):
+        root = tk.Tk()
+    app = QuizApp(root, profiler, args.memory_profile)
+
+    if args.profile_startup:
+
+        with profiler.phase("first frame"):
+            root.update()
+        within_budget = profiler.report(args.startup_budget)
+        app.prefetcher.stop()
+        root.destroy()
+        sys.exit(0 if within_budget else 1)
+    root.after_idle(warm_up_imports)
     root.mainloop()
+
+    if args.tcl_stats:
+        app.renderer.report()
@@ -0,0 +1,53 @@
+import io
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+def opentdb_dump(count):
+    return json.dumps({
+        "response_code": 0,
+        "results": [{
+            "type": "multiple",
+            "difficulty": "easy",
+            "category": "General &amp; Misc",
+            "question": f"Question {i} with \"quotes\", commas and {{braces}}?",
+            "correct_answer": "Right",
+            "incorrect_answers": ["Wrong", "Also wrong", "Still wrong"]
+        } for i in range(count)]
+    }, indent=1)
+
+
+class IterOpenTDBTest(unittest.TestCase):
+
+    def test_valid_dump_survives_every_chunk_size(self):
+        dump = opentdb_dump(3)
+        for chunk_size in range(1, len(dump) + 2):
+            records = list(main.QuestionImporter.iter_opentdb(io.StringIO(dump), chunk_size))
+            self.assertEqual([record["question"] for record in records],
+                             [f'Question {i} with "quotes", commas and {{braces}}?' for i in range(3)],
+                             f"chunk size {chunk_size}")
+
+    def test_compact_top_level_array(self):
+        dump = json.dumps(json.loads(opentdb_dump(4))["results"], separators=(",", ":"))
+        for chunk_size in range(1, len(dump) + 2):
+            records = list(main.QuestionImporter.iter_opentdb(io.StringIO(dump), chunk_size))
+            self.assertEqual(len(records), 4, f"chunk size {chunk_size}")
+            self.assertTrue(all(isinstance(record, dict) for record in records))
+
+    def test_malformed_record_is_counted_and_skipped(self):
+        dump = '{"results": [{"question": "A"}, {"question": oops}, {"question": "C"}]}'
+        for chunk_size in (1, 7, 64, 1 << 16):
+            records = list(main.QuestionImporter.iter_opentdb(io.StringIO(dump), chunk_size))
+            self.assertEqual(len(records), 3, f"chunk size {chunk_size}")
+            self.assertIsInstance(records[1], ValueError)
+            self.assertEqual(records[2], {"question": "C"})
+
+
+if __name__ == "__main__":
+    unittest.main()
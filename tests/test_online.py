@@ -0,0 +1,88 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+def make_question(text, category="General"):
+    return main.Question(text, ["A", "B", "C", "D"], 0, category)
+
+
+class FetchOpenTDBQuestionsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = main.FakeOpenTDBServer().start()
+        cls.session = main.new_http_session()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.session.close()
+        cls.server.stop()
+
+    def test_parses_requested_amount(self):
+        questions = main.fetch_opentdb_questions(self.session, "Hard", 5, self.server.url)
+        self.assertEqual(len(questions), 5)
+        for question in questions:
+            self.assertIsInstance(question, main.Question)
+            self.assertEqual(len(question.options), 4)
+            self.assertEqual(question.answer_text, "Right")
+
+    def test_unescapes_html_entities(self):
+        question = main.fetch_opentdb_questions(self.session, "Easy", 1, self.server.url)[0]
+        self.assertEqual(question.category, "Science & Nature")
+        self.assertIn('"Wrong"', question.options)
+        self.assertFalse(any("&quot;" in option for option in question.options))
+
+
+class OnlineQuestionCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = main.OnlineQuestionCache(self.tmp.name, max_entries=3)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def reopen(self):
+        self.cache.close()
+        self.cache = main.OnlineQuestionCache(self.tmp.name, max_entries=3)
+
+    def test_add_many_drops_cached_questions(self):
+        first = [make_question("Q1"), make_question("Q2")]
+        self.assertEqual(self.cache.add_many("Easy", first), first)
+        again = self.cache.add_many("Easy", [make_question("Q2"), make_question("Q3")])
+        self.assertEqual([question.text for question in again], ["Q3"])
+
+    def test_evicts_least_recently_used_across_reopen(self):
+        self.cache.add_many("Easy", [make_question(f"Q{i}") for i in range(3)])
+        self.cache.add_many("Easy", [make_question("Q0")])
+        self.cache.add_many("Easy", [make_question("Q3")])
+        self.reopen()
+        served = [self.cache.take("Easy").text for _ in range(3)]
+        self.assertEqual(served, ["Q2", "Q0", "Q3"])
+        self.assertEqual(self.cache.add_many("Easy", [make_question("Q1")])[0].text, "Q1")
+
+    def test_take_serves_requested_difficulty(self):
+        self.cache.add_many("Easy", [make_question("Easy one")])
+        self.cache.add_many("Hard", [make_question("Hard one")])
+        self.assertEqual(self.cache.take("Hard").text, "Hard one")
+        self.assertEqual(self.cache.take("Easy").text, "Easy one")
+        self.assertIsNone(self.cache.take("Medium"))
+
+    def test_round_trips_question_fields(self):
+        self.cache.add_many("Medium", [main.Question("Capital?", ["Rome", "Oslo", "Lima", "Bern"], 2, "Geography")])
+        self.reopen()
+        question = self.cache.take("Medium")
+        self.assertEqual(question.options, ("Rome", "Oslo", "Lima", "Bern"))
+        self.assertEqual(question.answer_text, "Lima")
+        self.assertEqual(question.category, "Geography")
+
+
+if __name__ == "__main__":
+    unittest.main()
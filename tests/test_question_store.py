@@ -0,0 +1,70 @@
+import collections
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+def bank(prefix, count, category="General"):
+    return [main.Question(f"{prefix}{i}", ["A", "B", "C", "D"], 0, category) for i in range(count)]
+
+
+class SQLiteQuestionStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = main.SQLiteQuestionStore(self.tmp.name)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def write_interleaved(self):
+        self.store.write_batch("Easy", bank("F", 100))
+        self.store.write_batch("Medium", bank("M", 10_000))
+        self.store.write_batch("Easy", bank("E", 100))
+
+    def test_sample_is_uniform_across_id_gaps(self):
+        self.write_interleaved()
+        draws = collections.Counter(self.store.sample("Easy").text for _ in range(20_000))
+        self.assertEqual(len(draws), 200)
+        self.assertLess(max(draws.values()), 250)
+
+    def test_session_never_repeats_and_fallback_is_random(self):
+        self.write_interleaved()
+        texts = [self.store.sample("Easy", session="s").text for _ in range(200)]
+        self.assertEqual(len(set(texts)), 200)
+        fallback = [self.store.sample("Easy", session="t", attempts=0).text for _ in range(10)]
+        self.assertEqual(len(set(fallback)), 10)
+        self.assertNotEqual(fallback, [f"F{i}" for i in range(10)])
+
+    def test_category_sampling_and_replace_source(self):
+        self.store.write_batch("Hard", bank("G", 50, "Geography"))
+        self.store.write_batch("Hard", bank("S", 50, "Science"), source="generated")
+        self.store.replace_source("Hard", "generated", bank("T", 30, "Science"))
+        self.assertEqual(self.store.count("Hard"), 80)
+        self.assertEqual(self.store.count("Hard", "Science"), 30)
+        draws = {self.store.sample("Hard", "Science").text for _ in range(2_000)}
+        self.assertEqual(draws, {f"T{i}" for i in range(30)})
+
+    def test_numbers_rows_of_older_stores(self):
+        db = sqlite3.connect(os.path.join(self.tmp.name, "questions.sqlite3"))
+        db.execute("""CREATE TABLE questions (id INTEGER PRIMARY KEY, difficulty TEXT NOT NULL,
+                      category TEXT NOT NULL, source TEXT NOT NULL, text TEXT NOT NULL,
+                      options TEXT NOT NULL, answer INTEGER NOT NULL)""")
+        db.executemany("INSERT INTO questions (id, difficulty, category, source, text, options, answer) "
+                       "VALUES (?, 'Easy', 'General', 'imported', ?, '[\"A\", \"B\", \"C\", \"D\"]', 0)",
+                       [(question_id, f"Q{question_id}") for question_id in (3, 40, 41, 900)])
+        db.commit()
+        db.close()
+        self.assertEqual(self.store.count("Easy"), 4)
+        self.assertEqual({self.store.sample("Easy").text for _ in range(500)}, {"Q3", "Q40", "Q41", "Q900"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+class PermutationSamplerTest(unittest.TestCase):
+
+    def test_each_round_draws_every_item_once(self):
+        for size in (1, 2, 3, 5, 17, 100, 1000, 4097):
+            sampler = main.PermutationSampler(list(range(size)), random.Random(size))
+            for _ in range(2):
+                self.assertEqual(sorted(sampler.draw() for _ in range(size)), list(range(size)), f"size {size}")
+
+    def test_remaining_counts_down_and_resets_on_resize(self):
+        items = list(range(10))
+        sampler = main.PermutationSampler(items, random.Random(1))
+        sampler.draw()
+        sampler.draw()
+        self.assertEqual(sampler.remaining(), 8)
+        items.extend(range(10, 15))
+        self.assertEqual(sampler.remaining(), 15)
+        self.assertEqual(sorted(sampler.draw() for _ in range(15)), list(range(15)))
+
+    def test_keys_give_different_orders(self):
+        orders = set()
+        for seed in range(20):
+            sampler = main.PermutationSampler(list(range(50)), random.Random(seed))
+            orders.add(tuple(sampler.draw() for _ in range(50)))
+        self.assertEqual(len(orders), 20)
+
+    def test_empty_pool(self):
+        self.assertIsNone(main.PermutationSampler([]).draw())
+
+
+if __name__ == "__main__":
+    unittest.main()